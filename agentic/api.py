@@ -10,12 +10,16 @@ Endpoints:
     GET /defaults - Agent default settings (camelCase, for frontend)
 """
 
+import os
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, AsyncExitStack
 from typing import Optional
 
+from dotenv import load_dotenv
 from fastapi import FastAPI, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
 from logging_config import setup_logging
@@ -41,30 +45,46 @@ async def lifespan(app: FastAPI):
     global orchestrator, ws_manager
 
     logger.info("Starting RedAmon Agent API...")
+    load_dotenv()
 
-    # Initialize orchestrator
-    orchestrator = AgentOrchestrator()
-    await orchestrator.initialize()
+    async with AsyncExitStack() as stack:
+        # Optional persistent async checkpointer (falls back to in-memory MemorySaver)
+        checkpointer = None
+        checkpoint_db = os.getenv("AGENT_CHECKPOINT_DB")
+        if checkpoint_db:
+            from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+            checkpointer = await stack.enter_async_context(
+                AsyncSqliteSaver.from_conn_string(checkpoint_db)
+            )
+            logger.info(f"Using AsyncSqliteSaver checkpointer at {checkpoint_db}")
 
-    # Initialize WebSocket manager
-    ws_manager = WebSocketManager()
+        # Initialize orchestrator
+        orchestrator = AgentOrchestrator(checkpointer=checkpointer)
+        await orchestrator.initialize()
 
-    logger.info("RedAmon Agent API ready (WebSocket)")
+        # Initialize WebSocket manager
+        ws_manager = WebSocketManager()
 
-    yield
+        logger.info("RedAmon Agent API ready (WebSocket)")
 
-    logger.info("Shutting down RedAmon Agent API...")
-    if orchestrator:
-        await orchestrator.close()
+        yield
+
+        logger.info("Shutting down RedAmon Agent API...")
+        if orchestrator:
+            await orchestrator.close()
 
 
 app = FastAPI(
     title="RedAmon Agent API",
     description="WebSocket API for real-time agent communication with phase tracking, MCP tools, and Neo4j integration",
     version="3.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+# Compress larger JSON responses (e.g. /defaults); WebSocket frames use permessage-deflate instead
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Add CORS middleware for webapp (allow all origins for development)
 app.add_middleware(
     CORSMiddleware,
@@ -84,7 +104,7 @@ class HealthResponse(BaseModel):
     status: str
     version: str
     tools_loaded: int
-    active_sessions: int
+    active_sessions: Optional[int] = None  # None when the checkpointer cannot count sessions
 
 
 # =============================================================================
@@ -101,7 +121,7 @@ async def health():
     """
     tools_count = 0
     if orchestrator and orchestrator.tool_executor:
-        tools_count = len(orchestrator.tool_executor.get_all_tools())
+        tools_count = orchestrator.tool_executor.get_tool_count()
 
     sessions_count = get_session_count()
 
@@ -109,7 +129,7 @@ async def health():
         status="ok" if orchestrator and orchestrator._initialized else "initializing",
         version="3.0.0",
         tools_loaded=tools_count,
-        active_sessions=sessions_count
+        active_sessions=sessions_count,
     )
 
 
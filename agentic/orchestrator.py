@@ -18,6 +18,7 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from langgraph.graph import StateGraph, START, END
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.checkpoint.memory import MemorySaver
 
 from state import (
@@ -25,23 +26,27 @@ from state import (
     InvokeResponse,
     ExecutionStep,
     LLMDecision,
-    TargetInfo,
     PhaseTransitionRequest,
-    PhaseHistoryEntry,
+    new_phase_history_entry,
+    new_target_info,
     UserQuestionRequest,
     UserQuestionAnswer,
     QAHistoryEntry,
     ConversationObjective,
     ObjectiveOutcome,
+    merge_target_info,
     format_todo_list,
+    TODO_STATUS_ICONS,
+    TODO_PRIORITY_MARKERS,
     format_execution_trace,
     format_qa_history,
     format_objective_history,
     migrate_legacy_objective,
     summarize_trace_for_response,
     utc_now,
+    short_id,
 )
-from project_settings import get_setting, load_project_settings
+from project_settings import get_setting, get_settings_version, load_project_settings
 from tools import (
     MCPToolsManager,
     Neo4jToolManager,
@@ -52,7 +57,9 @@ from tools import (
 )
 from prompts import (
     REACT_SYSTEM_PROMPT,
+    REACT_DYNAMIC_CONTEXT,
     PENDING_OUTPUT_ANALYSIS_SECTION,
+    PENDING_EMPTY_OUTPUT_SECTION,
     PHASE_TRANSITION_MESSAGE,
     USER_QUESTION_MESSAGE,
     FINAL_REPORT_PROMPT,
@@ -60,12 +67,19 @@ from prompts import (
 )
 from orchestrator_helpers import (
     json_dumps_safe,
+    dumps_for_prompt,
     extract_json,
     parse_llm_decision,
     try_parse_llm_decision,
     classify_attack_path,
     determine_phase_for_new_objective,
+    summarize_trace_steps,
     save_graph_image,
+    close_exploit_writer_driver,
+    LLMResponseCache,
+    astream_json_object,
+    cached_ainvoke,
+    message_text,
     set_checkpointer,
     create_config,
     get_config_values,
@@ -73,12 +87,21 @@ from orchestrator_helpers import (
     is_session_config_complete,
 )
 
-checkpointer = MemorySaver()
-set_checkpointer(checkpointer)
+logger = logging.getLogger(__name__)
 
-load_dotenv()
+# Shared read-only default for state lookups in routing (never mutated)
+_EMPTY_DECISION: dict = {}
+
+# Tools without shared session state, safe to run concurrently in one batch
+PARALLEL_SAFE_TOOLS = {"query_graph", "web_search", "execute_curl", "execute_naabu"}
+TOOL_BATCH_CONCURRENCY = 8
+
+
+def _is_parseable_decision(response) -> bool:
+    """Cache only think responses that parse into a decision, never broken ones."""
+    decision, _ = try_parse_llm_decision(message_text(response))
+    return decision is not None
 
-logger = logging.getLogger(__name__)
 
 SUPPORTED_GEMINI_MODELS = {
     "gemini-3-flash-preview",
@@ -97,8 +120,17 @@ class AgentOrchestrator:
     - Full execution trace in memory
     """
 
-    def __init__(self):
-        """Initialize the orchestrator with configuration."""
+    def __init__(self, checkpointer: Optional[BaseCheckpointSaver] = None):
+        """
+        Initialize the orchestrator with configuration.
+
+        Args:
+            checkpointer: LangGraph checkpointer for session state. Defaults to an
+                in-process MemorySaver; pass an async saver (e.g. AsyncSqliteSaver)
+                opened by the caller for persistent, non-blocking checkpoints.
+        """
+        # Loaded here rather than at import so importing this module has no side effects
+        load_dotenv()
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         self.anthropic_api_key = os.getenv("ANTHROPIC_API_KEY")
         self.google_api_key = os.getenv("GOOGLE_API_KEY")
@@ -108,13 +140,19 @@ class AgentOrchestrator:
 
         self.model_name: Optional[str] = None
         self.llm: Optional[BaseChatModel] = None
+        self.decision_llm = None  # self.llm, bound to JSON output where supported
         self.tool_executor: Optional[PhaseAwareToolExecutor] = None
         self.neo4j_manager: Optional[Neo4jToolManager] = None
         self.graph = None
+        self.checkpointer = checkpointer or MemorySaver()
+        set_checkpointer(self.checkpointer)
 
         self._initialized = False
+        self._graph_image_task: Optional[asyncio.Task] = None
         self._streaming_callback = None  # Set during invoke_with_streaming
         self._guidance_queue = None  # Set during invoke_with_streaming
+        self._llm_cache = LLMResponseCache()
+        self._system_prompt_cache: dict = {}  # (phase, attack_path_type, settings_version) -> prompt
 
     async def initialize(self) -> None:
         """Initialize tools and graph (LLM setup deferred until project_id is known)."""
@@ -128,6 +166,10 @@ class AgentOrchestrator:
         self._build_graph()
         self._initialized = True
 
+        # Graph image rendering can hit the network (mermaid.ink) - keep it off the startup path
+        if get_setting('CREATE_GRAPH_IMAGE_ON_INIT', False):
+            self._graph_image_task = asyncio.create_task(asyncio.to_thread(save_graph_image, self.graph))
+
         logger.info("AgentOrchestrator initialized (LLM deferred until project settings loaded)")
 
     def _apply_project_settings(self, project_id: str) -> None:
@@ -183,6 +225,14 @@ class AgentOrchestrator:
                 temperature=0,
             )
 
+        # Think-node decisions are always a single JSON object: on OpenAI, JSON mode
+        # guarantees a clean body so parsing takes the direct json-loads path.
+        # Kept off the base LLM, which also writes free-text reports and summaries.
+        if provider_name == "OpenAI":
+            self.decision_llm = self.llm.bind(response_format={"type": "json_object"})
+        else:
+            self.decision_llm = self.llm
+
         logger.info(f"LLM provider: {provider_name}")
 
     async def _setup_tools(self) -> None:
@@ -208,7 +258,7 @@ class AgentOrchestrator:
         self.tool_executor = PhaseAwareToolExecutor(mcp_manager, graph_tool, web_search_tool)
         self.tool_executor.register_mcp_tools(mcp_tools)
 
-        logger.info(f"Tools initialized: {len(self.tool_executor.get_all_tools())} available")
+        logger.info(f"Tools initialized: {self.tool_executor.get_tool_count()} available")
 
     def _build_graph(self) -> None:
         """Build the ReAct LangGraph with phase tracking."""
@@ -284,7 +334,7 @@ class AgentOrchestrator:
         # Final response always ends
         builder.add_edge("generate_response", END)
 
-        self.graph = builder.compile(checkpointer=checkpointer)
+        self.graph = builder.compile(checkpointer=self.checkpointer)
         logger.info("ReAct LangGraph compiled with checkpointer")
 
     # =========================================================================
@@ -302,7 +352,9 @@ class AgentOrchestrator:
 
         logger.info(f"[{user_id}/{project_id}/{session_id}] Initializing state...")
 
-        # Migrate legacy state if needed (backward compatibility)
+        # Migrate legacy state if needed (backward compatibility); the migration
+        # mutates the local copy only, so remember to return its fields below
+        missing_objectives = "conversation_objectives" not in state
         state = migrate_legacy_objective(state)
 
         # If resuming after approval/answer, preserve state for routing
@@ -324,11 +376,7 @@ class AgentOrchestrator:
 
         # Extract latest user message
         messages = state.get("messages", [])
-        latest_message = ""
-        for msg in reversed(messages):
-            if isinstance(msg, HumanMessage):
-                latest_message = msg.content
-                break
+        latest_message = next((m.content for m in reversed(messages) if isinstance(m, HumanMessage)), "")
 
         # Get current objective list
         objectives = state.get("conversation_objectives", [])
@@ -357,8 +405,9 @@ class AgentOrchestrator:
             # New objective if: task was completed, OR index out of bounds, OR message differs from current objective
             is_different_message = latest_message_str != current_obj_str
 
-            logger.debug(f"[{user_id}/{project_id}/{session_id}] New objective check: task_complete={task_was_complete}, "
-                        f"idx={current_idx}, len={len(objectives)}, is_different={is_different_message}")
+            logger.debug("[%s/%s/%s] New objective check: task_complete=%s, idx=%s, len=%s, is_different=%s",
+                         user_id, project_id, session_id, task_was_complete,
+                         current_idx, len(objectives), is_different_message)
 
             if task_was_complete or current_idx >= len(objectives) or is_different_message:
                 logger.info(f"[{user_id}/{project_id}/{session_id}] Detected new objective after task completion")
@@ -415,11 +464,10 @@ class AgentOrchestrator:
                     "current_phase": new_phase,
                     "attack_path_type": attack_path,
                     "completion_reason": None,
-                    # Preserve context except TODO list (new objective = fresh TODO list)
-                    "execution_trace": state.get("execution_trace", []),
+                    # Preserve context except TODO list (new objective = fresh TODO list);
+                    # execution_trace / phase_history are append-reduced, so left untouched
                     "target_info": state.get("target_info", {}),
                     "todo_list": [],  # Clear TODO list for new objective
-                    "phase_history": state.get("phase_history", []),
                     "user_id": user_id,
                     "project_id": project_id,
                     "session_id": session_id,
@@ -430,29 +478,71 @@ class AgentOrchestrator:
 
         # Otherwise, continue with current objective
         logger.info(f"[{user_id}/{project_id}/{session_id}] Continuing with current objective")
-        return {
-            "current_iteration": state.get("current_iteration", 0),
-            "max_iterations": state.get("max_iterations", get_setting('MAX_ITERATIONS', 100)),
-            "task_complete": False,
-            "current_phase": state.get("current_phase", "informational"),
-            "attack_path_type": state.get("attack_path_type", "cve_exploit"),
-            "phase_history": state.get("phase_history", [
-                PhaseHistoryEntry(phase="informational").model_dump()
-            ]),
-            "execution_trace": state.get("execution_trace", []),
-            "todo_list": state.get("todo_list", []),
-            "conversation_objectives": objectives,
-            "current_objective_index": current_idx,
-            "objective_history": state.get("objective_history", []),
-            "original_objective": state.get("original_objective", latest_message),  # Backward compat
-            "target_info": state.get("target_info", TargetInfo().model_dump()),
+
+        # Only return fields that are new or must change: every returned key is
+        # overwritten (and checkpointed) by LangGraph, so a resumed session with
+        # everything already set only refreshes its config identifiers
+        updates = {
             "user_id": user_id,
             "project_id": project_id,
             "session_id": session_id,
-            "awaiting_user_approval": False,
-            "phase_transition_pending": None,
         }
 
+        # Flags that must be cleared before a new run, only if actually set
+        if state.get("task_complete"):
+            updates["task_complete"] = False
+        if state.get("awaiting_user_approval"):
+            updates["awaiting_user_approval"] = False
+        if state.get("phase_transition_pending") is not None:
+            updates["phase_transition_pending"] = None
+
+        # Defaults for a fresh session (built only when missing)
+        if "current_iteration" not in state:
+            updates["current_iteration"] = 0
+        if not state.get("max_iterations"):
+            updates["max_iterations"] = get_setting('MAX_ITERATIONS', 100)
+        if not state.get("current_phase"):
+            updates["current_phase"] = "informational"
+        if not state.get("attack_path_type"):
+            updates["attack_path_type"] = "cve_exploit"
+        # phase_history is append-reduced, so only seed it on a fresh session
+        if not state.get("phase_history"):
+            updates["phase_history"] = [new_phase_history_entry("informational")]
+        if "todo_list" not in state:
+            updates["todo_list"] = []
+        if state.get("target_info") is None:
+            updates["target_info"] = new_target_info()
+        if not state.get("original_objective"):
+            updates["original_objective"] = latest_message  # Backward compat
+        if missing_objectives:
+            updates["conversation_objectives"] = objectives
+            updates["current_objective_index"] = current_idx
+            updates["objective_history"] = state.get("objective_history", [])
+
+        return updates
+
+    def _get_system_prompt(self, phase: str, attack_path_type: str) -> str:
+        """
+        Return the formatted think system prompt for a phase / attack path.
+
+        Only changes on phase transitions or project settings reloads, so it is
+        built once per (phase, attack path, settings version) and reused.
+        """
+        key = (phase, attack_path_type, get_settings_version())
+        system_prompt = self._system_prompt_cache.get(key)
+        if system_prompt is None:
+            # Get phase tools with attack path type for dynamic routing
+            available_tools = get_phase_tools(phase, get_setting('ACTIVATE_POST_EXPL_PHASE', True), get_setting('POST_EXPL_PHASE_TYPE', 'statefull'), attack_path_type)
+            system_prompt = REACT_SYSTEM_PROMPT.format(
+                current_phase=phase,
+                attack_path_type=attack_path_type,
+                available_tools=available_tools,
+            )
+            if len(self._system_prompt_cache) >= 32:
+                self._system_prompt_cache.clear()  # Entries from older settings versions
+            self._system_prompt_cache[key] = system_prompt
+        return system_prompt
+
     async def _think_node(self, state: AgentState, config = None) -> dict:
         """
         Core ReAct reasoning node.
@@ -485,30 +575,54 @@ class AgentOrchestrator:
             # Fallback to original_objective for backward compatibility
             current_objective = state.get("original_objective", "No objective specified")
 
+        # Compact older steps into a running summary so the trace sent to the LLM
+        # stays bounded; re-summarize only once a full window of new steps piled up
+        trace = state.get("execution_trace", [])
+        trace_summary = state.get("_trace_summary", "")
+        summary_upto = state.get("_trace_summary_upto", 0)
+        if summary_upto > len(trace):
+            trace_summary, summary_upto = "", 0
+        summary_updates = {}
+        window = get_setting('EXECUTION_TRACE_VERBATIM_STEPS', 10)
+        if window and len(trace) - summary_upto >= 2 * window:
+            new_upto = len(trace) - window
+            try:
+                trace_summary = await summarize_trace_steps(self.llm, trace_summary, trace[summary_upto:new_upto])
+                summary_upto = new_upto
+                summary_updates = {"_trace_summary": trace_summary, "_trace_summary_upto": summary_upto}
+            except Exception as e:
+                logger.warning(f"[{user_id}/{project_id}/{session_id}] Trace summarization failed, keeping full trace: {e}")
+
         # Build the prompt with current state
         execution_trace_formatted = format_execution_trace(
-            state.get("execution_trace", []),
+            trace,
             objectives=state.get("conversation_objectives", []),
             objective_history=state.get("objective_history", []),
-            current_objective_index=state.get("current_objective_index", 0)
+            current_objective_index=state.get("current_objective_index", 0),
+            last_n=min(len(trace) - summary_upto, get_setting('EXECUTION_TRACE_MEMORY_STEPS', 100)) if summary_upto else None,
+            cache_scope=(user_id, project_id, session_id),
         )
+        if summary_upto and trace_summary:
+            execution_trace_formatted = (
+                f"=== Summary of steps 1-{summary_upto} ===\n{trace_summary}\n\n"
+                f"=== Recent steps ===\n{execution_trace_formatted}"
+            )
         todo_list_formatted = format_todo_list(state.get("todo_list", []))
-        target_info_formatted = json_dumps_safe(state.get("target_info", {}), indent=2)
+        # Serialized once per change (see output analysis below), not once per iteration
+        target_info_formatted = state.get("_target_info_json") or dumps_for_prompt(state.get("target_info", {}))
         qa_history_formatted = format_qa_history(state.get("qa_history", []))
         objective_history_formatted = format_objective_history(state.get("objective_history", []))
 
-        # Get phase tools with attack path type for dynamic routing
+        # Static system prompt (stable across iterations -> provider prefix cache hit);
+        # everything that changes per iteration goes into the user message below
         attack_path_type = state.get("attack_path_type", "cve_exploit")
-        available_tools = get_phase_tools(phase, get_setting('ACTIVATE_POST_EXPL_PHASE', True), get_setting('POST_EXPL_PHASE_TYPE', 'statefull'), attack_path_type)
-
-        system_prompt = REACT_SYSTEM_PROMPT.format(
-            current_phase=phase,
-            attack_path_type=attack_path_type,
-            available_tools=available_tools,
+        system_prompt = self._get_system_prompt(phase, attack_path_type)
+        dynamic_context = REACT_DYNAMIC_CONTEXT.format(
             iteration=iteration,
             max_iterations=state.get("max_iterations", get_setting('MAX_ITERATIONS', 100)),
             objective=current_objective,  # Now uses current objective, not original
-            objective_history_summary=objective_history_formatted,  # Added
+            attack_path_type=attack_path_type,
+            objective_history_summary=objective_history_formatted,
             execution_trace=execution_trace_formatted,
             todo_list=todo_list_formatted,
             target_info=target_info_formatted,
@@ -524,7 +638,20 @@ class AgentOrchestrator:
             not pending_step.get("output_analysis")  # Not yet analyzed
         )
 
-        if has_pending_output:
+        # Errors/empty results carry nothing to extract: skip the analysis request
+        # (and its tokens) and synthesize the step's analysis after the decision
+        pending_output_empty = bool(has_pending_output) and not (pending_step.get("tool_output") or "").strip()
+
+        if pending_output_empty:
+            output_section = PENDING_EMPTY_OUTPUT_SECTION.format(
+                tool_name=pending_step.get("tool_name", "unknown"),
+                tool_args=json_dumps_safe(pending_step.get("tool_args") or {}),
+                success=pending_step.get("success", False),
+                error_message=pending_step.get("error_message") or "None (empty output)",
+            )
+            dynamic_context = dynamic_context + "\n" + output_section
+            logger.info(f"[{user_id}/{project_id}/{session_id}] Tool {pending_step.get('tool_name')} returned no output, skipping output analysis")
+        elif has_pending_output:
             tool_output_raw = pending_step.get("tool_output") or pending_step.get("error_message") or "No output"
             output_section = PENDING_OUTPUT_ANALYSIS_SECTION.format(
                 tool_name=pending_step.get("tool_name", "unknown"),
@@ -532,7 +659,7 @@ class AgentOrchestrator:
                 success=pending_step.get("success", False),
                 tool_output=tool_output_raw[:get_setting('TOOL_OUTPUT_MAX_CHARS', 20000)],
             )
-            system_prompt = system_prompt + "\n" + output_section
+            dynamic_context = dynamic_context + "\n" + output_section
             logger.info(f"[{user_id}/{project_id}/{session_id}] Injected output analysis section for tool: {pending_step.get('tool_name')}")
 
         # Drain pending guidance messages from user
@@ -554,32 +681,35 @@ class AgentOrchestrator:
             for i, msg in enumerate(guidance_messages, 1):
                 guidance_section += f"{i}. {msg}\n"
             guidance_section += "\nAcknowledge this guidance in your thought.\n"
-            system_prompt += guidance_section
+            dynamic_context += guidance_section
             logger.info(f"[{user_id}/{project_id}/{session_id}] Injected {len(guidance_messages)} guidance messages into prompt")
 
         # Log the full prompt for debugging
-        logger.info(f"\n{'#'*80}")
-        logger.info(f"# THINK NODE PROMPT - Iteration {iteration} - Phase: {phase}")
-        logger.info(f"{'#'*80}")
-        logger.info(f"\n--- EXECUTION TRACE ---\n{execution_trace_formatted}")
-        logger.info(f"\n--- TODO LIST ---\n{todo_list_formatted}")
-        logger.info(f"\n--- TARGET INFO ---\n{target_info_formatted}")
-        logger.info(f"\n--- Q&A HISTORY ---\n{qa_history_formatted}")
-        logger.info(f"\n--- FULL SYSTEM PROMPT ({len(system_prompt)} chars) ---")
-        # Log full prompt in chunks to avoid log line limits
-        chunk_size = 4000
-        for i in range(0, len(system_prompt), chunk_size):
-            chunk = system_prompt[i:i+chunk_size]
-            logger.info(f"PROMPT[{i}:{i+len(chunk)}]:\n{chunk}")
-        logger.info(f"{'#'*80}\n")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"\n{'#'*80}")
+            logger.info(f"# THINK NODE PROMPT - Iteration {iteration} - Phase: {phase}")
+            logger.info(f"{'#'*80}")
+            logger.info(f"\n--- EXECUTION TRACE ---\n{execution_trace_formatted}")
+            logger.info(f"\n--- TODO LIST ---\n{todo_list_formatted}")
+            logger.info(f"\n--- TARGET INFO ---\n{target_info_formatted}")
+            logger.info(f"\n--- Q&A HISTORY ---\n{qa_history_formatted}")
+            full_prompt = system_prompt + "\n" + dynamic_context
+            logger.info(f"\n--- FULL PROMPT ({len(system_prompt)} static + {len(dynamic_context)} dynamic chars) ---")
+            # Log full prompt in chunks to avoid log line limits
+            chunk_size = 4000
+            for i in range(0, len(full_prompt), chunk_size):
+                chunk = full_prompt[i:i+chunk_size]
+                logger.info(f"PROMPT[{i}:{i+len(chunk)}]:\n{chunk}")
+            logger.info(f"{'#'*80}\n")
 
         # Get LLM decision with retry on parse failures
         messages = [
             SystemMessage(content=system_prompt),
-            HumanMessage(content="Based on the current state, what is your next action? Output EXACTLY ONE valid JSON object and nothing else. Do NOT simulate tool execution - you will receive actual tool output after submitting your decision. Do NOT output multiple JSON objects or continue the conversation - just ONE decision JSON.")
+            HumanMessage(content=dynamic_context + "\n\nBased on the current state, what is your next action? Output EXACTLY ONE valid JSON object and nothing else. Do NOT simulate tool execution - you will receive actual tool output after submitting your decision. Do NOT output multiple JSON objects or continue the conversation - just ONE decision JSON.")
         ]
 
         max_retries = get_setting('LLM_PARSE_MAX_RETRIES', 3)
+        cache_ttl = get_setting('LLM_CACHE_TTL_SECONDS', 300)
         decision = None
         last_error = None
         response_text = ""
@@ -594,21 +724,29 @@ class AgentOrchestrator:
                             f"Fix the error and output EXACTLY ONE valid JSON object. No extra text."
                 ))
 
-            response = await self.llm.ainvoke(messages)
-            
+            response = await cached_ainvoke(
+                self.decision_llm, messages, self._llm_cache,
+                namespace=f"{self.model_name}:{user_id}/{project_id}/{session_id}",
+                invoke=astream_json_object,
+                ttl=cache_ttl,
+                validate=_is_parseable_decision,
+            )
+
+            usage = getattr(response, "usage_metadata", None) or {}
+            cached_tokens = (usage.get("input_token_details") or {}).get("cache_read")
+            if cached_tokens is not None:
+                logger.debug("Think prompt: %s input tokens, %s served from prompt cache", usage.get("input_tokens"), cached_tokens)
+
             # Handle different content types (string vs list of blocks)
-            if isinstance(response.content, list):
-                # Extract text content from blocks if it's a list
-                response_text = "".join([block.get("text", "") if isinstance(block, dict) else str(block) for block in response.content]).strip()
-            else:
-                response_text = response.content.strip() if response.content else ""
+            response_text = message_text(response)
 
             # Log the raw LLM response
-            logger.info(f"\n{'='*60}")
-            logger.info(f"LLM RAW RESPONSE - Iteration {iteration} (attempt {attempt+1}/{max_retries})")
-            logger.info(f"{'='*60}")
-            logger.info(f"{response_text}")
-            logger.info(f"{'='*60}\n")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"\n{'='*60}")
+                logger.info(f"LLM RAW RESPONSE - Iteration {iteration} (attempt {attempt+1}/{max_retries})")
+                logger.info(f"{'='*60}")
+                logger.info(f"{response_text}")
+                logger.info(f"{'='*60}\n")
 
             decision, last_error = try_parse_llm_decision(response_text)
             if decision:
@@ -628,81 +766,97 @@ class AgentOrchestrator:
         logger.info(f"[{user_id}/{project_id}/{session_id}] Decision: action={decision.action}, tool={decision.tool_name}")
 
         # Detailed logging for debugging
-        logger.info(f"\n{'='*60}")
-        logger.info(f"THINK NODE - Iteration {iteration} - Phase: {phase}")
-        logger.info(f"{'='*60}")
-        logger.info(f"THOUGHT: {decision.thought}")
-        logger.info(f"REASONING: {decision.reasoning}")
-        logger.info(f"ACTION: {decision.action}")
-        if decision.tool_name:
-            logger.info(f"TOOL: {decision.tool_name}")
-            logger.info(f"TOOL_ARGS: {json_dumps_safe(decision.tool_args, indent=2) if decision.tool_args else 'None'}")
-        if decision.phase_transition:
-            logger.info(f"PHASE_TRANSITION: {decision.phase_transition.to_phase}")
-
-        # Log todo list updates
-        if decision.updated_todo_list:
-            logger.info(f"TODO LIST ({len(decision.updated_todo_list)} items):")
-            for todo in decision.updated_todo_list:
-                status_icon = {
-                    "pending": "[ ]",
-                    "in_progress": "[~]",
-                    "completed": "[x]",
-                    "blocked": "[!]"
-                }.get(todo.status, "[ ]")
-                priority_marker = {"high": "!!!", "medium": "!!", "low": "!"}.get(todo.priority, "!!")
-                logger.info(f"  {status_icon} {priority_marker} {todo.description}")
-        else:
-            logger.info(f"TODO LIST: (no updates)")
-
-        # Log Q&A history if present
-        qa_history = state.get("qa_history", [])
-        if qa_history:
-            logger.info(f"Q&A HISTORY ({len(qa_history)} entries):")
-            for i, entry in enumerate(qa_history, 1):
-                q = entry.get("question", {})
-                a = entry.get("answer", {})
-                logger.info(f"  Q{i}: {q.get('question', 'N/A')[:10000]}")
-                logger.info(f"      Answer: {a.get('answer', 'N/A')[:10000] if a else '(unanswered)'}")
-        else:
-            logger.info(f"Q&A HISTORY: (none)")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"\n{'='*60}")
+            logger.info(f"THINK NODE - Iteration {iteration} - Phase: {phase}")
+            logger.info(f"{'='*60}")
+            logger.info(f"THOUGHT: {decision.thought}")
+            logger.info(f"REASONING: {decision.reasoning}")
+            logger.info(f"ACTION: {decision.action}")
+            if decision.tool_name:
+                logger.info(f"TOOL: {decision.tool_name}")
+                logger.info(f"TOOL_ARGS: {json_dumps_safe(decision.tool_args, indent=2 if logger.isEnabledFor(logging.DEBUG) else None) if decision.tool_args else 'None'}")
+            if decision.phase_transition:
+                logger.info(f"PHASE_TRANSITION: {decision.phase_transition.to_phase}")
+
+            # Log todo list updates
+            if decision.updated_todo_list:
+                logger.info(f"TODO LIST ({len(decision.updated_todo_list)} items):")
+                for todo in decision.updated_todo_list:
+                    status_icon = TODO_STATUS_ICONS.get(todo.status, "[ ]")
+                    priority_marker = TODO_PRIORITY_MARKERS.get(todo.priority, "!!")
+                    logger.info(f"  {status_icon} {priority_marker} {todo.description}")
+            else:
+                logger.info(f"TODO LIST: (no updates)")
+
+            # Log Q&A history if present
+            qa_history = state.get("qa_history", [])
+            if qa_history:
+                logger.info(f"Q&A HISTORY ({len(qa_history)} entries):")
+                for i, entry in enumerate(qa_history, 1):
+                    q = entry.get("question", {})
+                    a = entry.get("answer", {})
+                    logger.info(f"  Q{i}: {q.get('question', 'N/A')[:10000]}")
+                    logger.info(f"      Answer: {a.get('answer', 'N/A')[:10000] if a else '(unanswered)'}")
+            else:
+                logger.info(f"Q&A HISTORY: (none)")
 
-        # Log user_question if action is ask_user
-        if decision.action == "ask_user" and decision.user_question:
-            logger.info(f"USER_QUESTION:")
-            logger.info(f"  Question: {decision.user_question.question}")
-            logger.info(f"  Context: {decision.user_question.context}")
-            logger.info(f"  Format: {decision.user_question.format}")
-            if decision.user_question.options:
-                logger.info(f"  Options: {decision.user_question.options}")
+            # Log user_question if action is ask_user
+            if decision.action == "ask_user" and decision.user_question:
+                logger.info(f"USER_QUESTION:")
+                logger.info(f"  Question: {decision.user_question.question}")
+                logger.info(f"  Context: {decision.user_question.context}")
+                logger.info(f"  Format: {decision.user_question.format}")
+                if decision.user_question.options:
+                    logger.info(f"  Options: {decision.user_question.options}")
 
-        logger.info(f"{'='*60}\n")
+            logger.info(f"{'='*60}\n")
 
-        # Create execution step
-        step = ExecutionStep(
-            iteration=iteration,
-            phase=phase,
-            thought=decision.thought,
-            reasoning=decision.reasoning,
-            tool_name=decision.tool_name if decision.action == "use_tool" else None,
-            tool_args=decision.tool_args if decision.action == "use_tool" else None,
-        )
+        # Create execution step as a plain dict (same fields as ExecutionStep): the
+        # decision is already validated, so skip a model build + model_dump per iteration
+        use_tool = decision.action == "use_tool"
+        step = {
+            "step_id": short_id(),
+            "iteration": iteration,
+            "timestamp": utc_now(),
+            "phase": phase,
+            "thought": decision.thought,
+            "reasoning": decision.reasoning,
+            "tool_name": decision.tool_name if use_tool else None,
+            "tool_args": decision.tool_args if use_tool else None,
+            "tool_calls": [dict(tc) for tc in decision.tool_calls] if use_tool and decision.tool_calls else None,
+            "tool_output": None,
+            "output_analysis": None,
+            "success": True,
+            "error_message": None,
+        }
 
-        # Convert todo list updates to dicts for state storage
-        todo_list = [item.model_dump() for item in decision.updated_todo_list] if decision.updated_todo_list else state.get("todo_list", [])
+        # Convert todo list updates to dicts for state storage (flat models, shallow dict is enough)
+        todo_list = [dict(item) for item in decision.updated_todo_list] if decision.updated_todo_list else state.get("todo_list", [])
 
         # Build state updates
         updates = {
             "current_iteration": iteration,
             "todo_list": todo_list,
-            "_current_step": step.model_dump(),
-            "_decision": decision.model_dump(),
+            "_current_step": step,
+            # Routing/streaming only read the top-level fields; the analysis and todo
+            # list are stored separately above, so don't serialize them twice
+            "_decision": decision.model_dump(exclude={"output_analysis", "updated_todo_list"}),
             "_just_transitioned_to": None,  # Clear the marker
             "_completed_step": None,  # Will be set if we process pending output
         }
+        updates.update(summary_updates)
 
         # Process output analysis if we had pending tool output
-        if has_pending_output:
+        if pending_output_empty:
+            error_message = pending_step.get("error_message") or "empty output"
+            pending_step["output_analysis"] = f"Tool {pending_step.get('tool_name')} returned no output: {error_message}"
+            pending_step["actionable_findings"] = []
+            pending_step["recommended_next_steps"] = ["Retry with different arguments or another tool"]
+            updates["execution_trace"] = [pending_step]
+            updates["_completed_step"] = pending_step
+
+        elif has_pending_output:
             if decision.output_analysis:
                 analysis = decision.output_analysis
 
@@ -712,32 +866,22 @@ class AgentOrchestrator:
                 pending_step["recommended_next_steps"] = analysis.recommended_next_steps or []
 
                 # Log analysis results
-                logger.info(f"\n{'='*60}")
-                logger.info(f"OUTPUT ANALYSIS (inline) - Iteration {iteration} - Phase: {phase}")
-                logger.info(f"{'='*60}")
-                logger.info(f"TOOL: {pending_step.get('tool_name')}")
-                logger.info(f"INTERPRETATION: {analysis.interpretation[:2000]}")
-                if analysis.actionable_findings:
-                    logger.info(f"ACTIONABLE FINDINGS: {analysis.actionable_findings}")
-                if analysis.recommended_next_steps:
-                    logger.info(f"RECOMMENDED NEXT STEPS: {analysis.recommended_next_steps}")
-                if analysis.exploit_succeeded:
-                    logger.info(f"EXPLOIT SUCCEEDED: {analysis.exploit_details}")
-                logger.info(f"{'='*60}\n")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(f"\n{'='*60}")
+                    logger.info(f"OUTPUT ANALYSIS (inline) - Iteration {iteration} - Phase: {phase}")
+                    logger.info(f"{'='*60}")
+                    logger.info(f"TOOL: {pending_step.get('tool_name')}")
+                    logger.info(f"INTERPRETATION: {analysis.interpretation[:2000]}")
+                    if analysis.actionable_findings:
+                        logger.info(f"ACTIONABLE FINDINGS: {analysis.actionable_findings}")
+                    if analysis.recommended_next_steps:
+                        logger.info(f"RECOMMENDED NEXT STEPS: {analysis.recommended_next_steps}")
+                    if analysis.exploit_succeeded:
+                        logger.info(f"EXPLOIT SUCCEEDED: {analysis.exploit_details}")
+                    logger.info(f"{'='*60}\n")
 
                 # Merge target info
-                current_target = TargetInfo(**state.get("target_info", {}))
-                extracted = analysis.extracted_info
-                new_target = TargetInfo(
-                    primary_target=extracted.primary_target,
-                    ports=extracted.ports,
-                    services=extracted.services,
-                    technologies=extracted.technologies,
-                    vulnerabilities=extracted.vulnerabilities,
-                    credentials=extracted.credentials,
-                    sessions=extracted.sessions,
-                )
-                merged_target = current_target.merge_from(new_target)
+                merged_target_info = merge_target_info(state.get("target_info") or {}, analysis.extracted_info)
 
                 # Exploit success detection (moved from old _analyze_output_node)
                 if analysis.exploit_succeeded and analysis.exploit_details and phase == "exploitation":
@@ -748,9 +892,9 @@ class AgentOrchestrator:
                             self.neo4j_uri, self.neo4j_user, self.neo4j_password,
                             user_id, project_id,
                             attack_type=details.get("attack_type", state.get("attack_path_type", "cve_exploit")),
-                            target_ip=details.get("target_ip", merged_target.primary_target),
+                            target_ip=details.get("target_ip", merged_target_info["primary_target"]),
                             target_port=details.get("target_port"),
-                            cve_ids=details.get("cve_ids", merged_target.vulnerabilities),
+                            cve_ids=details.get("cve_ids", merged_target_info["vulnerabilities"]),
                             session_id=details.get("session_id"),
                             username=details.get("username"),
                             password=details.get("password"),
@@ -762,9 +906,10 @@ class AgentOrchestrator:
                         logger.error(f"[{user_id}/{project_id}/{session_id}] Failed to create Exploit node: {e}")
 
                 # Append completed step to execution trace
-                execution_trace = state.get("execution_trace", []) + [pending_step]
-                updates["execution_trace"] = execution_trace
-                updates["target_info"] = merged_target.model_dump()
+                updates["execution_trace"] = [pending_step]
+                if merged_target_info != state.get("target_info"):
+                    updates["target_info"] = merged_target_info
+                    updates["_target_info_json"] = dumps_for_prompt(merged_target_info)
                 updates["_completed_step"] = pending_step  # For streaming emission
                 updates["messages"] = [AIMessage(content=f"**Step {pending_step.get('iteration')}** [{phase}]\n\n{analysis.interpretation}")]
 
@@ -774,8 +919,7 @@ class AgentOrchestrator:
                 pending_step["output_analysis"] = (pending_step.get("tool_output") or "")[:2000]
                 pending_step["actionable_findings"] = []
                 pending_step["recommended_next_steps"] = []
-                execution_trace = state.get("execution_trace", []) + [pending_step]
-                updates["execution_trace"] = execution_trace
+                updates["execution_trace"] = [pending_step]
                 updates["_completed_step"] = pending_step
 
         # Handle different actions
@@ -826,9 +970,7 @@ class AgentOrchestrator:
             if to_phase == "informational" and phase in ["exploitation", "post_exploitation"]:
                 logger.info(f"[{user_id}/{project_id}/{session_id}] Auto-approving safe downgrade: {phase} → informational")
                 updates["current_phase"] = to_phase
-                updates["phase_history"] = state.get("phase_history", []) + [
-                    PhaseHistoryEntry(phase=to_phase).model_dump()
-                ]
+                updates["phase_history"] = [new_phase_history_entry(to_phase)]
                 updates["_just_transitioned_to"] = to_phase
 
                 # Add system message to context
@@ -858,9 +1000,7 @@ class AgentOrchestrator:
             else:
                 # Auto-approve if not required
                 updates["current_phase"] = to_phase
-                updates["phase_history"] = state.get("phase_history", []) + [
-                    PhaseHistoryEntry(phase=to_phase).model_dump()
-                ]
+                updates["phase_history"] = [new_phase_history_entry(to_phase)]
 
         elif decision.action == "ask_user":
             # Handle ask_user action - agent wants to ask user a question
@@ -938,22 +1078,24 @@ class AgentOrchestrator:
         tool_args = step_data.get("tool_args") or {}
         phase = state.get("current_phase", "informational")
         iteration = state.get("current_iteration", 0)
+        tool_calls = step_data.get("tool_calls") or []
 
         # Detailed logging - tool execution start
-        logger.info(f"\n{'='*60}")
-        logger.info(f"EXECUTE TOOL - Iteration {iteration} - Phase: {phase}")
-        logger.info(f"{'='*60}")
-        logger.info(f"TOOL_NAME: {tool_name}")
-        logger.info(f"TOOL_ARGS:")
-        if tool_args:
-            for key, value in tool_args.items():
-                # Truncate long values for readability
-                val_str = str(value)
-                if len(val_str) > 200:
-                    val_str = val_str[:10000]
-                logger.info(f"  {key}: {val_str}")
-        else:
-            logger.info("  (no arguments)")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"\n{'='*60}")
+            logger.info(f"EXECUTE TOOL - Iteration {iteration} - Phase: {phase}")
+            logger.info(f"{'='*60}")
+            logger.info(f"TOOL_NAME: {tool_name}")
+            logger.info(f"TOOL_ARGS:")
+            if tool_args:
+                for key, value in tool_args.items():
+                    # Truncate long values for readability
+                    val_str = str(value)
+                    if len(val_str) > 200:
+                        val_str = val_str[:10000]
+                    logger.info(f"  {key}: {val_str}")
+            else:
+                logger.info("  (no arguments)")
 
         # Handle missing tool name
         if not tool_name:
@@ -975,7 +1117,8 @@ class AgentOrchestrator:
         # Auto-reset Metasploit on first use in this session
         msf_reset_done = state.get("msf_session_reset_done", False)
         extra_updates = {}
-        if tool_name == "metasploit_console" and not msf_reset_done:
+        batch_tool_names = {tc.get("tool_name") for tc in tool_calls} or {tool_name}
+        if "metasploit_console" in batch_tool_names and not msf_reset_done:
             logger.info(f"[{user_id}/{project_id}/{session_id}] Auto-resetting Metasploit state (first use in session)")
             # Restart msfconsole completely for a clean state
             # This kills any stuck sessions and starts fresh
@@ -990,7 +1133,10 @@ class AgentOrchestrator:
         )
 
         # Execute the tool (with progress streaming for long-running commands)
-        if is_long_running_msf and self._streaming_callback:
+        if len(tool_calls) > 1:
+            logger.info(f"[{user_id}/{project_id}/{session_id}] Executing batch of {len(tool_calls)} tool calls")
+            result = await self._execute_tool_batch(tool_calls, phase)
+        elif is_long_running_msf and self._streaming_callback:
             logger.info(f"[{user_id}/{project_id}/{session_id}] Using execute_with_progress for long-running MSF command")
             result = await self.tool_executor.execute_with_progress(
                 tool_name,
@@ -1016,20 +1162,22 @@ class AgentOrchestrator:
         success = step_data.get("success", False)
         error_msg = step_data.get("error_message")
 
-        logger.info(f"SUCCESS: {success}")
-        if error_msg:
-            logger.info(f"ERROR: {error_msg}")
-
-        logger.info(f"TOOL_OUTPUT ({len(tool_output)} chars):")
-        if tool_output:
-            output_preview = tool_output[:100000]
-            for line in output_preview.split('\n'):
-                logger.info(f"  | {line}")
-            if len(tool_output) > 100000:
-                logger.info(f"  | ... ({len(tool_output) - 100000} more chars)")
-        else:
-            logger.info("  (empty output)")
-        logger.info(f"{'='*60}\n")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"SUCCESS: {success}")
+            if error_msg:
+                logger.info(f"ERROR: {error_msg}")
+
+            output_len = len(tool_output)
+            logger.info(f"TOOL_OUTPUT ({output_len} chars):")
+            if tool_output:
+                output_preview = tool_output if output_len <= 100000 else tool_output[:100000]
+                # One log record for the whole preview instead of one per line
+                logger.info("  | " + output_preview.replace("\n", "\n  | "))
+                if output_len > 100000:
+                    logger.info(f"  | ... ({output_len - 100000} more chars)")
+            else:
+                logger.info("  (empty output)")
+            logger.info(f"{'='*60}\n")
 
         updates = {
             "_current_step": step_data,
@@ -1039,6 +1187,41 @@ class AgentOrchestrator:
         updates.update(extra_updates)
         return updates
 
+    async def _execute_tool_batch(self, tool_calls: list, phase: str) -> dict:
+        """
+        Execute a batch of independent tool calls and merge their outputs.
+
+        Calls run concurrently (bounded by TOOL_BATCH_CONCURRENCY) when every tool is
+        stateless; any stateful tool (e.g. metasploit_console) forces sequential order.
+        """
+        async def run(tc: dict) -> dict:
+            result = await self.tool_executor.execute(tc.get("tool_name"), tc.get("tool_args") or {}, phase)
+            return result or {"success": False, "error": "Tool execution returned no result"}
+
+        if all(tc.get("tool_name") in PARALLEL_SAFE_TOOLS for tc in tool_calls):
+            semaphore = asyncio.Semaphore(TOOL_BATCH_CONCURRENCY)
+
+            async def bounded(tc: dict) -> dict:
+                async with semaphore:
+                    return await run(tc)
+
+            results = await asyncio.gather(*(bounded(tc) for tc in tool_calls))
+        else:
+            results = [await run(tc) for tc in tool_calls]
+
+        sections, errors = [], []
+        for tc, result in zip(tool_calls, results):
+            name = tc.get("tool_name")
+            sections.append(f"[{name}] {json_dumps_safe(tc.get('tool_args') or {})}\n{result.get('output') or ''}")
+            if result.get("error"):
+                errors.append(f"{name}: {result['error']}")
+
+        return {
+            "success": all(r.get("success", False) for r in results),
+            "output": "\n---\n".join(sections),
+            "error": "; ".join(errors) or None,
+        }
+
     async def _await_approval_node(self, state: AgentState, config = None) -> dict:
         """Pause and request user approval for phase transition."""
         user_id, project_id, session_id = get_identifiers(state, config)
@@ -1108,16 +1291,13 @@ class AgentOrchestrator:
                 success=True,
                 output_analysis=f"Phase transition approved. Agent is now in {new_phase} phase and can use {new_phase}-specific tools. DO NOT request another transition to {new_phase} - you are already there.",
             )
-            updated_trace = state.get("execution_trace", []) + [transition_step.model_dump()]
 
             return {
                 **clear_approval_state,
                 "current_phase": new_phase,
-                "phase_history": state.get("phase_history", []) + [
-                    PhaseHistoryEntry(phase=new_phase).model_dump()
-                ],
+                "phase_history": [new_phase_history_entry(new_phase)],
                 "conversation_objectives": objectives,  # Updated
-                "execution_trace": updated_trace,  # Add transition to trace so LLM sees it
+                "execution_trace": [transition_step.model_dump()],  # Add transition to trace so LLM sees it
                 "messages": [AIMessage(content=f"Phase transition approved. Now in **{new_phase}** phase.")],
                 # Mark that we just transitioned to prevent re-requesting
                 "_just_transitioned_to": new_phase,
@@ -1222,16 +1402,19 @@ class AgentOrchestrator:
                 state.get("execution_trace", []),
                 objectives=state.get("conversation_objectives", []),
                 objective_history=state.get("objective_history", []),
-                current_objective_index=state.get("current_objective_index", 0)
+                current_objective_index=state.get("current_objective_index", 0),
+                cache_scope=(user_id, project_id, session_id),
             ),
-            target_info=json_dumps_safe(state.get("target_info", {}), indent=2),
+            # Reuse the pretty-printed JSON kept in state since the last target_info change
+            target_info=state.get("_target_info_json") or dumps_for_prompt(state.get("target_info", {})),
             todo_list=format_todo_list(state.get("todo_list", [])),
         )
 
         response = await self.llm.ainvoke([HumanMessage(content=report_prompt)])
 
         return {
-            "messages": [AIMessage(content=response.content)],
+            # The LLM already returns an AIMessage; keep it (and its usage metadata) as is
+            "messages": [response],
             "task_complete": True,
             "completion_reason": state.get("completion_reason") or "Task completed successfully",
         }
@@ -1256,8 +1439,9 @@ class AgentOrchestrator:
 
     def _route_after_think(self, state: AgentState) -> str:
         """Route based on think node decision."""
-        # Check for max iterations
-        if state.get("current_iteration", 0) >= state.get("max_iterations", get_setting('MAX_ITERATIONS', 100)):
+        # Check for max iterations (the settings lookup only runs if the state lacks a limit)
+        max_iterations = state.get("max_iterations") or get_setting('MAX_ITERATIONS', 100)
+        if (state.get("current_iteration") or 0) >= max_iterations:
             logger.info("Max iterations reached, generating response")
             return "generate_response"
 
@@ -1274,7 +1458,7 @@ class AgentOrchestrator:
             return "await_question"
 
         # Check decision action (may have been modified by _think_node when ignoring transitions)
-        decision = state.get("_decision", {})
+        decision = state.get("_decision") or _EMPTY_DECISION
         action = decision.get("action", "use_tool")
         tool_name = decision.get("tool_name")
 
@@ -1353,7 +1537,7 @@ class AgentOrchestrator:
 
         except Exception as e:
             logger.error(f"[{user_id}/{project_id}/{session_id}] Error: {e}")
-            return InvokeResponse(error=str(e))
+            return InvokeResponse.model_construct(error=str(e))
 
     async def resume_after_approval(
         self,
@@ -1377,7 +1561,7 @@ class AgentOrchestrator:
             current_state = await self.graph.aget_state(config)
 
             if not current_state or not current_state.values:
-                return InvokeResponse(error="No pending session found")
+                return InvokeResponse.model_construct(error="No pending session found")
 
             # Update state with approval response
             update_data = {
@@ -1396,7 +1580,7 @@ class AgentOrchestrator:
 
         except Exception as e:
             logger.error(f"[{user_id}/{project_id}/{session_id}] Resume error: {e}")
-            return InvokeResponse(error=str(e))
+            return InvokeResponse.model_construct(error=str(e))
 
     async def resume_after_answer(
         self,
@@ -1419,7 +1603,7 @@ class AgentOrchestrator:
             current_state = await self.graph.aget_state(config)
 
             if not current_state or not current_state.values:
-                return InvokeResponse(error="No pending session found")
+                return InvokeResponse.model_construct(error="No pending session found")
 
             # Update state with user's answer
             update_data = {
@@ -1436,10 +1620,27 @@ class AgentOrchestrator:
 
         except Exception as e:
             logger.error(f"[{user_id}/{project_id}/{session_id}] Resume error: {e}")
-            return InvokeResponse(error=str(e))
+            return InvokeResponse.model_construct(error=str(e))
 
     def _build_response(self, state: dict) -> InvokeResponse:
-        """Build InvokeResponse from final state."""
+        """
+        Build InvokeResponse from final state.
+
+        Every field comes from state the graph nodes produced (already validated
+        dicts and primitives), so the response is constructed without re-validation.
+        """
+        # Waiting for approval: the client only needs the transition request,
+        # so skip the answer scan and trace summary
+        if state.get("awaiting_user_approval"):
+            return InvokeResponse.model_construct(
+                current_phase=state.get("current_phase", "informational"),
+                iteration_count=state.get("current_iteration", 0),
+                message_count=len(state.get("messages", [])),
+                todo_list=state.get("todo_list", []),
+                awaiting_approval=True,
+                approval_request=state.get("phase_transition_pending"),
+            )
+
         # Extract final answer from messages
         final_answer = ""
         tool_used = None
@@ -1457,13 +1658,14 @@ class AgentOrchestrator:
             tool_used = step.get("tool_name")
             tool_output = step.get("tool_output")
 
-        return InvokeResponse(
+        return InvokeResponse.model_construct(
             answer=final_answer,
             tool_used=tool_used,
             tool_output=tool_output,
             current_phase=state.get("current_phase", "informational"),
             iteration_count=state.get("current_iteration", 0),
             task_complete=state.get("task_complete", False),
+            message_count=len(messages),
             todo_list=state.get("todo_list", []),
             execution_trace_summary=summarize_trace_for_response(
                 state.get("execution_trace", [])
@@ -1538,7 +1740,7 @@ class AgentOrchestrator:
         except Exception as e:
             logger.error(f"[{user_id}/{project_id}/{session_id}] Streaming error: {e}")
             await streaming_callback.on_error(str(e), recoverable=False)
-            return InvokeResponse(error=str(e))
+            return InvokeResponse.model_construct(error=str(e))
         finally:
             self._streaming_callback = None
             self._guidance_queue = None
@@ -1571,7 +1773,7 @@ class AgentOrchestrator:
             current_state = await self.graph.aget_state(config)
             if not current_state or not current_state.values:
                 await streaming_callback.on_error("No pending session found", recoverable=False)
-                return InvokeResponse(error="No pending session found")
+                return InvokeResponse.model_construct(error="No pending session found")
 
             # Update with approval
             update_data = {
@@ -1600,7 +1802,7 @@ class AgentOrchestrator:
         except Exception as e:
             logger.error(f"[{user_id}/{project_id}/{session_id}] Resume streaming error: {e}")
             await streaming_callback.on_error(str(e), recoverable=False)
-            return InvokeResponse(error=str(e))
+            return InvokeResponse.model_construct(error=str(e))
         finally:
             self._streaming_callback = None
             self._guidance_queue = None
@@ -1632,7 +1834,7 @@ class AgentOrchestrator:
             current_state = await self.graph.aget_state(config)
             if not current_state or not current_state.values:
                 await streaming_callback.on_error("No pending session found", recoverable=False)
-                return InvokeResponse(error="No pending session found")
+                return InvokeResponse.model_construct(error="No pending session found")
 
             # Update with answer
             update_data = {
@@ -1660,7 +1862,7 @@ class AgentOrchestrator:
         except Exception as e:
             logger.error(f"[{user_id}/{project_id}/{session_id}] Resume streaming error: {e}")
             await streaming_callback.on_error(str(e), recoverable=False)
-            return InvokeResponse(error=str(e))
+            return InvokeResponse.model_construct(error=str(e))
         finally:
             self._streaming_callback = None
             self._guidance_queue = None
@@ -1689,7 +1891,7 @@ class AgentOrchestrator:
             current_state = await self.graph.aget_state(config)
             if not current_state or not current_state.values:
                 await streaming_callback.on_error("No session state to resume", recoverable=False)
-                return InvokeResponse(error="No session state to resume")
+                return InvokeResponse.model_construct(error="No session state to resume")
 
             # Re-invoke graph from last checkpoint with empty input
             final_state = None
@@ -1712,7 +1914,7 @@ class AgentOrchestrator:
         except Exception as e:
             logger.error(f"[{user_id}/{project_id}/{session_id}] Resume execution error: {e}")
             await streaming_callback.on_error(str(e), recoverable=False)
-            return InvokeResponse(error=str(e))
+            return InvokeResponse.model_construct(error=str(e))
         finally:
             self._streaming_callback = None
             self._guidance_queue = None
@@ -1833,4 +2035,7 @@ class AgentOrchestrator:
     async def close(self) -> None:
         """Clean up resources."""
         self._initialized = False
+        if self.neo4j_manager:
+            self.neo4j_manager.close()
+        close_exploit_writer_driver()
         logger.info("AgentOrchestrator closed")
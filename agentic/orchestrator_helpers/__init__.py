@@ -5,9 +5,11 @@ to keep the architectural flow clear and maintainable.
 """
 
 from .json_utils import (
-    DateTimeEncoder,
     json_dumps_safe,
+    dumps_for_prompt,
     extract_json,
+    parse_json_object,
+    JsonObjectTracker,
 )
 
 from .parsing import (
@@ -21,6 +23,10 @@ from .phase import (
     determine_phase_for_new_objective,
 )
 
+from .trace import (
+    summarize_trace_steps,
+)
+
 from .exploit_writer import (
     create_exploit_node,
     close_driver as close_exploit_writer_driver,
@@ -30,6 +36,13 @@ from .debug import (
     save_graph_image,
 )
 
+from .llm_cache import (
+    LLMResponseCache,
+    astream_json_object,
+    cached_ainvoke,
+    message_text,
+)
+
 from .config import (
     set_checkpointer,
     get_checkpointer,
@@ -42,9 +55,11 @@ from .config import (
 
 __all__ = [
     # json_utils
-    "DateTimeEncoder",
     "json_dumps_safe",
+    "dumps_for_prompt",
     "extract_json",
+    "parse_json_object",
+    "JsonObjectTracker",
     # parsing
     "parse_llm_decision",
     "try_parse_llm_decision",
@@ -52,11 +67,18 @@ __all__ = [
     # phase
     "classify_attack_path",
     "determine_phase_for_new_objective",
+    # trace
+    "summarize_trace_steps",
     # exploit_writer
     "create_exploit_node",
     "close_exploit_writer_driver",
     # debug
     "save_graph_image",
+    # llm_cache
+    "LLMResponseCache",
+    "astream_json_object",
+    "cached_ainvoke",
+    "message_text",
     # config
     "set_checkpointer",
     "get_checkpointer",
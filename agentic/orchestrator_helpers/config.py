@@ -6,19 +6,19 @@ from state import AgentState
 from project_settings import get_setting
 
 if TYPE_CHECKING:
-    from langgraph.checkpoint.memory import MemorySaver
+    from langgraph.checkpoint.base import BaseCheckpointSaver
 
 
-_checkpointer: "MemorySaver | None" = None
+_checkpointer: "BaseCheckpointSaver | None" = None
 
 
-def set_checkpointer(cp: "MemorySaver") -> None:
+def set_checkpointer(cp: "BaseCheckpointSaver") -> None:
     """Set the checkpointer reference (called by orchestrator)."""
     global _checkpointer
     _checkpointer = cp
 
 
-def get_checkpointer() -> "MemorySaver | None":
+def get_checkpointer() -> "BaseCheckpointSaver | None":
     """Get the checkpointer reference."""
     return _checkpointer
 
@@ -90,6 +90,16 @@ def get_config_values(config) -> Tuple[str, str, str]:
     if config is None:
         return ("unknown", "unknown", "unknown")
 
+    # Fast path: RunnableConfig is a TypedDict, so LangGraph always passes a plain dict
+    if type(config) is dict:
+        configurable = config.get("configurable")
+        if type(configurable) is dict:
+            return (
+                configurable.get("user_id", "unknown"),
+                configurable.get("project_id", "unknown"),
+                configurable.get("session_id", "unknown")
+            )
+
     # LangGraph passes RunnableConfig - try multiple ways to access configurable
     configurable = None
 
@@ -141,7 +151,12 @@ def get_identifiers(state: AgentState, config=None) -> Tuple[str, str, str]:
     Returns:
         Tuple of (user_id, project_id, session_id)
     """
-    user_id, project_id, session_id = get_config_values(config)
+    ids = get_config_values(config)
+    # Config normally carries all three, so skip the state fallbacks
+    if "unknown" not in ids:
+        return ids
+
+    user_id, project_id, session_id = ids
 
     # Fallback to state values if config doesn't have them
     if user_id == "unknown":
@@ -1,6 +1,7 @@
 """Debug and visualization helpers for the orchestrator."""
 
 import os
+import hashlib
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,6 +11,10 @@ def save_graph_image(graph, base_dir: str = None) -> None:
     """
     Save the LangGraph structure as a PNG image.
 
+    Rendering goes through the mermaid.ink web service, so the image is only
+    re-rendered when the graph structure changes: a hash of the (locally
+    generated) mermaid source is stored next to the PNG and compared on startup.
+
     Args:
         graph: The compiled LangGraph instance
         base_dir: Base directory for saving the image. If None, uses the directory
@@ -21,10 +26,23 @@ def save_graph_image(graph, base_dir: str = None) -> None:
             base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
         image_path = os.path.join(base_dir, "graph_structure.png")
-        png_data = graph.get_graph().draw_mermaid_png()
+        hash_path = image_path + ".sha256"
+
+        drawable = graph.get_graph()
+        graph_hash = hashlib.sha256(drawable.draw_mermaid().encode()).hexdigest()
+
+        if os.path.exists(image_path) and os.path.exists(hash_path):
+            with open(hash_path) as f:
+                if f.read().strip() == graph_hash:
+                    logger.info(f"Graph structure unchanged, keeping {image_path}")
+                    return
+
+        png_data = drawable.draw_mermaid_png()
 
         with open(image_path, "wb") as f:
             f.write(png_data)
+        with open(hash_path, "w") as f:
+            f.write(graph_hash)
 
         logger.info(f"Graph structure image saved to {image_path}")
     except Exception as e:
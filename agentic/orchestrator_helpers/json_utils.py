@@ -1,22 +1,31 @@
 """JSON utilities for the orchestrator."""
 
 import json
-from datetime import datetime
 from typing import Optional, Any
 
+import orjson
+from pydantic_core import from_json
 
-class DateTimeEncoder(json.JSONEncoder):
-    """JSON encoder that handles datetime objects."""
 
-    def default(self, o):
-        if isinstance(o, datetime):
-            return o.isoformat()
-        return super().default(o)
+def json_dumps_safe(obj, indent: Optional[int] = None) -> str:
+    """
+    JSON dumps with datetime support, via orjson (C implementation).
 
+    Any truthy indent produces 2-space indentation (the only width orjson supports);
+    non-string dict keys are stringified and unknown types fall back to str().
+    """
+    option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+    return orjson.dumps(obj, default=str, option=option).decode()
 
-def json_dumps_safe(obj, **kwargs) -> str:
-    """JSON dumps with datetime support."""
-    return json.dumps(obj, cls=DateTimeEncoder, **kwargs)
+
+def dumps_for_prompt(obj) -> str:
+    """Pretty-print a value for inclusion in an LLM prompt (orjson, 2-space indent)."""
+    return json_dumps_safe(obj, indent=2)
+
+
+_TEXT_CONTAINER_TYPES = (dict, list)
+
+_JSON_DECODER = json.JSONDecoder()
 
 
 def _coerce_to_text(response_text: Any) -> str:
@@ -29,13 +38,13 @@ def _coerce_to_text(response_text: Any) -> str:
         for item in response_text:
             if isinstance(item, str):
                 parts.append(item)
-            elif isinstance(item, (dict, list)):
-                parts.append(json.dumps(item, cls=DateTimeEncoder))
+            elif isinstance(item, _TEXT_CONTAINER_TYPES):
+                parts.append(json_dumps_safe(item))
             else:
                 parts.append(str(item))
         return "\n".join(parts)
-    if isinstance(response_text, (dict, list)):
-        return json.dumps(response_text, cls=DateTimeEncoder)
+    if isinstance(response_text, dict):
+        return json_dumps_safe(response_text)
     return str(response_text)
 
 
@@ -48,3 +57,106 @@ def extract_json(response_text: Any) -> Optional[str]:
     if json_start >= 0 and json_end > json_start:
         return text[json_start:json_end]
     return None
+
+
+def _scan_json_object(text: str) -> Optional[dict]:
+    """
+    Find the first "{" at which a complete JSON object decodes.
+
+    Handles prose with stray braces before the real object (e.g. "use `{foo}`
+    syntax"); raw_decode stops at the end of the object, so trailing text is fine.
+    """
+    last_error = None
+    idx = text.find("{")
+    while idx >= 0:
+        try:
+            data, _ = _JSON_DECODER.raw_decode(text, idx)
+            if isinstance(data, dict):
+                return data
+        except json.JSONDecodeError as e:
+            last_error = e
+        idx = text.find("{", idx + 1)
+    if last_error is not None:
+        raise last_error
+    return None
+
+
+def parse_json_object(response_text: Any) -> Optional[dict]:
+    """
+    Locate and parse the first JSON object in an LLM response in one pass.
+
+    The text is encoded once and parsed from the first "{" with pydantic-core's
+    jiter parser. If trailing text (e.g. a closing markdown fence) makes that
+    fail, the region is cut at the last "}"; if that fails too (stray braces in
+    surrounding prose), each "{" is tried in turn with the C-accelerated stdlib
+    raw_decode.
+
+    Returns:
+        The parsed dict, or None if no JSON object is found
+
+    Raises:
+        ValueError: If a "{...}" region exists but no JSON object decodes
+    """
+    text = _coerce_to_text(response_text)
+    buf = text.encode("utf-8")
+    try:
+        start = buf.index(b"{")
+    except ValueError:
+        return None
+    try:
+        data = from_json(buf[start:])
+    except ValueError:
+        end = buf.rfind(b"}") + 1
+        try:
+            data = from_json(buf[start:end]) if end > start else None
+        except ValueError:
+            data = None
+        if not isinstance(data, dict):
+            data = _scan_json_object(text)
+    return data if isinstance(data, dict) else None
+
+
+class JsonObjectTracker:
+    """
+    Incremental brace matcher for streamed LLM output.
+
+    Feed text chunks as they arrive; `complete` becomes True once the first
+    top-level brace group has closed (braces inside strings are ignored), and
+    `end` is the offset in the last chunk just past its closing brace.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the current brace group and start matching afresh."""
+        self.depth = 0
+        self.started = False
+        self.complete = False
+        self.end = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk: str) -> bool:
+        """Consume a chunk; returns True once the first object is complete."""
+        for i, ch in enumerate(chunk):
+            if self.complete:
+                break
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"' and self.started:
+                self._in_string = True
+            elif ch == "{":
+                self.depth += 1
+                self.started = True
+            elif ch == "}" and self.started:
+                self.depth -= 1
+                if self.depth == 0:
+                    self.complete = True
+                    self.end = i + 1
+        return self.complete
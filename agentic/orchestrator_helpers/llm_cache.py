@@ -0,0 +1,164 @@
+"""LLM invocation helpers: response cache and early-stopping streaming."""
+
+import time
+import hashlib
+import logging
+from collections import OrderedDict
+from contextlib import aclosing
+from typing import Awaitable, Callable, Optional, Tuple
+
+import orjson
+from langchain_core.messages import BaseMessage
+
+from .json_utils import JsonObjectTracker, parse_json_object
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache:
+    """
+    LRU cache of LLM responses keyed by a hash of the exact prompt.
+
+    Entries expire after `ttl` seconds. Only safe for temperature=0 calls,
+    where an identical prompt is expected to produce the same answer.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, BaseMessage]]" = OrderedDict()
+
+    @staticmethod
+    def make_key(messages: list, namespace: str = "") -> str:
+        """Hash message types and contents (plus a namespace such as model/session)."""
+        payload = orjson.dumps(
+            [namespace, [(m.type, m.content) for m in messages]],
+            default=str,
+            option=orjson.OPT_SORT_KEYS,
+        )
+        return hashlib.sha256(payload).hexdigest()
+
+    def get(self, key: str, ttl: Optional[float] = None) -> Optional[BaseMessage]:
+        """Return the cached response, or None if missing or older than `ttl` (default: self.ttl)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, response = entry
+        if time.monotonic() - stored_at > (self.ttl if ttl is None else ttl):
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    def set(self, key: str, response: BaseMessage) -> None:
+        self._entries[key] = (time.monotonic(), response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+async def _ainvoke(llm, messages: list) -> BaseMessage:
+    return await llm.ainvoke(messages)
+
+
+def _chunk_text(content) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(block.get("text", "") if isinstance(block, dict) else str(block) for block in content)
+    return ""
+
+
+def message_text(message: BaseMessage) -> str:
+    """Text of an LLM response, joining content blocks when the content is a list."""
+    return _chunk_text(message.content).strip()
+
+
+async def astream_json_object(llm, messages: list) -> BaseMessage:
+    """
+    Stream the LLM response and stop as soon as the first JSON object closes.
+
+    Decisions must be exactly one JSON object, so anything generated after it
+    (a second object, simulated tool output) is discarded without waiting for it.
+    A balanced brace group that does not parse (prose such as "`{target}`") does
+    not stop the stream; matching restarts after it. The stream is closed
+    explicitly when stopping early so the HTTP response is released at once.
+
+    Returns:
+        The accumulated response message (an AIMessageChunk)
+    """
+    tracker = JsonObjectTracker()
+    response = None
+    parts = []
+    async with aclosing(llm.astream(messages)) as stream:
+        async for chunk in stream:
+            response = chunk if response is None else response + chunk
+            pending = _chunk_text(chunk.content)
+            parts.append(pending)
+            while tracker.feed(pending):
+                try:
+                    parsed = parse_json_object("".join(parts))
+                except ValueError:
+                    parsed = None
+                if isinstance(parsed, dict):
+                    logger.debug("JSON object complete, stopping LLM stream early")
+                    return response
+                pending = pending[tracker.end:]
+                tracker.reset()
+    if response is None:
+        return await llm.ainvoke(messages)
+    return response
+
+
+async def cached_ainvoke(
+    llm,
+    messages: list,
+    cache: Optional[LLMResponseCache],
+    namespace: str = "",
+    invoke: Optional[Callable[..., Awaitable[BaseMessage]]] = None,
+    ttl: Optional[float] = None,
+    validate: Optional[Callable[[BaseMessage], bool]] = None,
+) -> BaseMessage:
+    """
+    Invoke the LLM, returning a cached response for an identical prompt.
+
+    Args:
+        llm: The LLM instance to call on a cache miss
+        messages: Prompt messages
+        cache: Response cache (None or ttl <= 0 disables caching)
+        namespace: Extra key component (e.g. model name and session id)
+        invoke: Coroutine function (llm, messages) used on a miss; defaults to llm.ainvoke
+        ttl: Max age of a reusable entry in seconds; defaults to cache.ttl
+        validate: Predicate a fresh response must pass to be cached, so that
+                  truncated or unparseable responses are not replayed on retry
+
+    Returns:
+        The LLM response message
+    """
+    invoke = invoke or _ainvoke
+
+    if ttl is None and cache is not None:
+        ttl = cache.ttl
+    if cache is None or ttl <= 0:
+        return await invoke(llm, messages)
+
+    key = cache.make_key(messages, namespace)
+    response = cache.get(key, ttl)
+    if response is not None:
+        cache.hits += 1
+        logger.info(f"LLM cache hit (hits={cache.hits}, misses={cache.misses})")
+        return response
+
+    cache.misses += 1
+    response = await invoke(llm, messages)
+    if validate is not None and not validate(response):
+        logger.debug("LLM response failed validation, not caching it")
+        return response
+    cache.set(key, response)
+    logger.debug(f"LLM cache miss (hits={cache.hits}, misses={cache.misses})")
+    return response
@@ -1,15 +1,21 @@
 """LLM response parsing helpers for the orchestrator."""
 
-import json
 import re
 import logging
 from typing import Optional, Tuple
 
+from pydantic import ValidationError
+
 from state import LLMDecision, OutputAnalysis, ExtractedTargetInfo
-from .json_utils import extract_json
+from .json_utils import parse_json_object
 
 logger = logging.getLogger(__name__)
 
+# Compiled validators, resolved once at import (the models are fully built by
+# then) so the per-iteration parse skips the model_validate classmethod dispatch
+_DECISION_VALIDATOR = LLMDecision.__pydantic_validator__
+_ANALYSIS_VALIDATOR = OutputAnalysis.__pydantic_validator__
+
 
 def _normalize_extracted_info(extracted: dict) -> None:
     """
@@ -66,13 +72,14 @@ def try_parse_llm_decision(response_text: str) -> Tuple[Optional[LLMDecision], O
         (decision, None) on success, or (None, error_message) on failure.
     """
     try:
-        json_str = extract_json(response_text)
-        if not json_str:
+        # Single pass: clean JSON bodies (JSON-mode responses) and objects wrapped
+        # in markdown fences / surrounding text go through the same parser
+        data = parse_json_object(response_text)
+        if data is None:
             return None, "No JSON object found in response"
 
         # Pre-process JSON to handle empty nested objects that would fail validation
         # LLM sometimes outputs empty objects like user_question: {} or phase_transition: {}
-        data = json.loads(json_str)
 
         # Remove empty user_question object (would fail validation due to required fields)
         if "user_question" in data and (not data["user_question"] or data["user_question"] == {}):
@@ -93,8 +100,10 @@ def try_parse_llm_decision(response_text: str) -> Tuple[Optional[LLMDecision], O
             extracted = data["output_analysis"]["extracted_info"]
             _normalize_extracted_info(extracted)
 
-        return LLMDecision.model_validate(data), None
-    except json.JSONDecodeError as e:
+        return _DECISION_VALIDATOR.validate_python(data), None
+    except ValidationError as e:
+        return None, f"Validation error: {e}"
+    except ValueError as e:
         return None, f"Invalid JSON: {e}"
     except Exception as e:
         return None, f"Validation error: {e}"
@@ -119,15 +128,13 @@ def parse_llm_decision(response_text: str) -> LLMDecision:
 def parse_analysis_response(response_text: str) -> OutputAnalysis:
     """Parse analysis response from LLM using Pydantic validation."""
     try:
-        json_str = extract_json(response_text)
-        if json_str:
-            data = json.loads(json_str)
-
+        data = parse_json_object(response_text)
+        if data:
             # Normalize extracted_info fields (services, sessions, etc.)
             if "extracted_info" in data and isinstance(data["extracted_info"], dict):
                 _normalize_extracted_info(data["extracted_info"])
 
-            return OutputAnalysis.model_validate(data)
+            return _ANALYSIS_VALIDATOR.validate_python(data)
     except Exception as e:
         logger.warning(f"Failed to parse analysis response: {e}")
 
@@ -137,9 +144,8 @@ def parse_analysis_response(response_text: str) -> OutputAnalysis:
     fallback_next_steps = []
 
     try:
-        json_str = extract_json(response_text)
-        if json_str:
-            data = json.loads(json_str)
+        data = parse_json_object(response_text)
+        if data:
             if "interpretation" in data:
                 fallback_interpretation = data["interpretation"]
             if "actionable_findings" in data and isinstance(data["actionable_findings"], list):
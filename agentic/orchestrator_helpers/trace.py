@@ -0,0 +1,35 @@
+"""Execution trace compaction helpers for the orchestrator."""
+
+import logging
+
+from langchain_core.messages import HumanMessage
+
+from state import format_trace_steps
+from prompts import TRACE_SUMMARY_PROMPT
+
+logger = logging.getLogger(__name__)
+
+
+async def summarize_trace_steps(llm, previous_summary: str, steps: list) -> str:
+    """
+    Fold a batch of older execution steps into the running trace summary.
+
+    Args:
+        llm: The LLM instance to use for summarization
+        previous_summary: Current summary (empty string if none yet)
+        steps: Execution step dicts to fold in
+
+    Returns:
+        Updated summary text
+    """
+    prompt = TRACE_SUMMARY_PROMPT.format(
+        previous_summary=previous_summary or "(none yet)",
+        steps=format_trace_steps(steps),
+    )
+    response = await llm.ainvoke([HumanMessage(content=prompt)])
+    content = response.content
+    if isinstance(content, list):
+        content = "".join(block.get("text", "") if isinstance(block, dict) else str(block) for block in content)
+    summary = (content or "").strip()
+    logger.info(f"Compacted {len(steps)} execution steps into trace summary ({len(summary)} chars)")
+    return summary
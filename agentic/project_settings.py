@@ -37,6 +37,7 @@ DEFAULT_AGENT_SETTINGS: dict[str, Any] = {
     # Agent Limits
     'MAX_ITERATIONS': 100,
     'EXECUTION_TRACE_MEMORY_STEPS': 100,
+    'EXECUTION_TRACE_VERBATIM_STEPS': 10,  # Older steps are LLM-summarized (0 = disabled)
     'TOOL_OUTPUT_MAX_CHARS': 20000,
 
     # Approval Gates
@@ -49,6 +50,9 @@ DEFAULT_AGENT_SETTINGS: dict[str, Any] = {
     # LLM Parse Retry
     'LLM_PARSE_MAX_RETRIES': 3,
 
+    # LLM Response Cache (0 = disabled)
+    'LLM_CACHE_TTL_SECONDS': 300,
+
     # Debug
     'CREATE_GRAPH_IMAGE_ON_INIT': False,
 
@@ -143,6 +147,8 @@ def get_settings() -> dict[str, Any]:
 # Singleton settings instance
 _settings: Optional[dict[str, Any]] = None
 _current_project_id: Optional[str] = None
+# Bumped whenever _settings is replaced, so callers can cache settings-derived values
+_settings_version: int = 0
 
 
 def load_project_settings(project_id: str) -> dict[str, Any]:
@@ -158,12 +164,14 @@ def load_project_settings(project_id: str) -> dict[str, Any]:
     Returns:
         Dictionary of settings in SCREAMING_SNAKE_CASE format
     """
-    global _settings, _current_project_id
+    global _settings, _current_project_id, _settings_version
 
     # Skip if already loaded for this project
     if _current_project_id == project_id and _settings is not None:
         return _settings
 
+    _settings_version += 1
+
     webapp_url = os.environ.get('WEBAPP_API_URL')
 
     if not webapp_url:
@@ -200,12 +208,18 @@ def get_setting(key: str, default: Any = None) -> Any:
     return get_settings().get(key, default)
 
 
+def get_settings_version() -> int:
+    """Return a counter that changes every time the active settings are replaced."""
+    return _settings_version
+
+
 def reload_settings(project_id: Optional[str] = None) -> dict[str, Any]:
     """Force reload of settings for a project."""
-    global _settings, _current_project_id
+    global _settings, _current_project_id, _settings_version
     if project_id:
         _current_project_id = None  # Force refetch
         return load_project_settings(project_id)
+    _settings_version += 1
     _settings = None
     _current_project_id = None
     return get_settings()
@@ -215,18 +229,34 @@ def reload_settings(project_id: Optional[str] = None) -> dict[str, Any]:
 # TOOL PHASE RESTRICTION HELPERS (moved from params.py)
 # =============================================================================
 
+# Reverse index of TOOL_PHASE_MAP, rebuilt only when the settings version changes
+_tool_phase_index: Optional[tuple[int, frozenset, dict[str, tuple]]] = None
+
+
+def _get_tool_phase_index() -> tuple[frozenset, dict[str, tuple]]:
+    """Return ({(tool, phase), ...}, {phase: (tool, ...)}) for the active TOOL_PHASE_MAP."""
+    global _tool_phase_index
+    version = _settings_version
+    if _tool_phase_index is None or _tool_phase_index[0] != version:
+        tool_phase_map = get_setting('TOOL_PHASE_MAP', {})
+        allowed = frozenset(
+            (tool_name, phase)
+            for tool_name, phases in tool_phase_map.items()
+            for phase in phases
+        )
+        per_phase: dict[str, list] = {}
+        for tool_name, phases in tool_phase_map.items():
+            for phase in phases:
+                per_phase.setdefault(phase, []).append(tool_name)
+        _tool_phase_index = (version, allowed, {p: tuple(t) for p, t in per_phase.items()})
+    return _tool_phase_index[1], _tool_phase_index[2]
+
+
 def is_tool_allowed_in_phase(tool_name: str, phase: str) -> bool:
     """Check if a tool is allowed in the given phase."""
-    tool_phase_map = get_setting('TOOL_PHASE_MAP', {})
-    allowed_phases = tool_phase_map.get(tool_name, [])
-    return phase in allowed_phases
-
-
-def get_allowed_tools_for_phase(phase: str) -> list:
-    """Get list of tool names allowed in the given phase."""
-    tool_phase_map = get_setting('TOOL_PHASE_MAP', {})
-    return [
-        tool_name
-        for tool_name, allowed_phases in tool_phase_map.items()
-        if phase in allowed_phases
-    ]
+    return (tool_name, phase) in _get_tool_phase_index()[0]
+
+
+def get_allowed_tools_for_phase(phase: str) -> tuple:
+    """Get the names of tools allowed in the given phase."""
+    return _get_tool_phase_index()[1].get(phase, ())
@@ -12,8 +12,11 @@ from .base import (
     INFORMATIONAL_TOOLS,
     METASPLOIT_CONSOLE_HEADER,
     REACT_SYSTEM_PROMPT,
+    REACT_DYNAMIC_CONTEXT,
+    TRACE_SUMMARY_PROMPT,
     OUTPUT_ANALYSIS_PROMPT,
     PENDING_OUTPUT_ANALYSIS_SECTION,
+    PENDING_EMPTY_OUTPUT_SECTION,
     PHASE_TRANSITION_MESSAGE,
     USER_QUESTION_MESSAGE,
     FINAL_REPORT_PROMPT,
@@ -53,9 +56,11 @@ EXPLOITATION_TOOLS = CVE_EXPLOIT_TOOLS
 PAYLOAD_GUIDANCE_STATEFULL = CVE_PAYLOAD_GUIDANCE_STATEFULL
 PAYLOAD_GUIDANCE_STATELESS = CVE_PAYLOAD_GUIDANCE_STATELESS
 
+from functools import lru_cache
+
 # Import utilities
 from utils import get_session_config_prompt
-from project_settings import get_setting
+from project_settings import get_setting, get_settings_version
 
 
 def get_phase_tools(
@@ -76,6 +81,18 @@ def get_phase_tools(
     Returns:
         Concatenated tool descriptions appropriate for the phase, mode, and attack path.
     """
+    return _build_phase_tools(phase, activate_post_expl, post_expl_type, attack_path_type, get_settings_version())
+
+
+@lru_cache(maxsize=32)
+def _build_phase_tools(
+    phase: str,
+    activate_post_expl: bool,
+    post_expl_type: str,
+    attack_path_type: str,
+    settings_version: int,
+) -> str:
+    """Build the phase tool section; cached per settings version (see get_phase_tools)."""
     parts = []
     is_statefull = post_expl_type == "statefull"
 
@@ -168,8 +185,11 @@ __all__ = [
     "INFORMATIONAL_TOOLS",
     "METASPLOIT_CONSOLE_HEADER",
     "REACT_SYSTEM_PROMPT",
+    "REACT_DYNAMIC_CONTEXT",
+    "TRACE_SUMMARY_PROMPT",
     "OUTPUT_ANALYSIS_PROMPT",
     "PENDING_OUTPUT_ANALYSIS_SECTION",
+    "PENDING_EMPTY_OUTPUT_SECTION",
     "PHASE_TRANSITION_MESSAGE",
     "USER_QUESTION_MESSAGE",
     "FINAL_REPORT_PROMPT",
@@ -110,6 +110,9 @@ All Informational tools PLUS:
 # REACT SYSTEM PROMPT
 # =============================================================================
 
+# Static part of the think prompt: only varies with phase / attack path / settings,
+# so it stays byte-identical across iterations and hits the provider's prompt
+# prefix cache. Per-iteration state goes in REACT_DYNAMIC_CONTEXT (user message).
 REACT_SYSTEM_PROMPT = """You are RedAmon, an AI penetration testing assistant using the ReAct (Reasoning and Acting) framework.
 
 ## Your Operating Model
@@ -233,30 +236,9 @@ For RESEARCH requests, use Neo4j as the primary source:
 - Follow the MANDATORY workflow for your classified attack path
 - The workflow provides all steps you need
 
-## Current State
-
-**Iteration**: {iteration}/{max_iterations}
-**Current Objective**: {objective}
-**Attack Path**: {attack_path_type}
-
-### Previous Objectives
-{objective_history_summary}
-
-### Previous Execution Steps
-{execution_trace}
-
-### Current Todo List
-{todo_list}
-
-### Known Target Information
-{target_info}
-
-### Previous Questions & Answers
-{qa_history}
-
 ## Your Task
 
-Based on the context above, decide your next action. You MUST output valid JSON:
+Based on the current state provided in the user message, decide your next action. You MUST output valid JSON:
 
 **IMPORTANT: Only include fields relevant to your chosen action. Omit unused fields!**
 
@@ -267,6 +249,7 @@ Based on the context above, decide your next action. You MUST output valid JSON:
     "action": "<one of: use_tool, transition_phase, complete, ask_user>",
     "tool_name": "<only if action=use_tool: query_graph, web_search, execute_curl, execute_naabu, or metasploit_console>",
     "tool_args": "<only if action=use_tool: {{'question': '...'}} or {{'args': '...'}} or {{'command': '...'}}",
+    "tool_calls": "<optional, only if action=use_tool: [{{'tool_name': '...', 'tool_args': {{...}}}}, ...] to run several INDEPENDENT tools in parallel (replaces tool_name/tool_args)>",
     "phase_transition": "<only if action=transition_phase>",
     "user_question": "<only if action=ask_user>",
     "completion_reason": "<only if action=complete>",
@@ -334,7 +317,7 @@ Action: complete
 ```
 
 ### Action Types:
-- **use_tool**: Execute a tool. Include tool_name and tool_args only.
+- **use_tool**: Execute a tool. Include tool_name and tool_args only. When several lookups do not depend on each other (e.g. query_graph + web_search + execute_curl), you may instead send them together as a `tool_calls` list; they run in parallel and you receive all outputs at once.
 - **transition_phase**: Request phase change. Include phase_transition object only.
 - **complete**: Task is finished. Include completion_reason only.
 - **ask_user**: Ask user for clarification. Include user_question object only.
@@ -419,6 +402,53 @@ Use ask_user when you need user input that cannot be determined from available d
 """
 
 
+# =============================================================================
+# REACT DYNAMIC CONTEXT (per-iteration state, sent after the static system prompt)
+# =============================================================================
+
+REACT_DYNAMIC_CONTEXT = """## Current State
+
+**Iteration**: {iteration}/{max_iterations}
+**Current Objective**: {objective}
+**Attack Path**: {attack_path_type}
+
+### Previous Objectives
+{objective_history_summary}
+
+### Previous Execution Steps
+{execution_trace}
+
+### Current Todo List
+{todo_list}
+
+### Known Target Information
+{target_info}
+
+### Previous Questions & Answers
+{qa_history}
+"""
+
+
+# =============================================================================
+# EXECUTION TRACE SUMMARY PROMPT (compacts steps older than the verbatim window)
+# =============================================================================
+
+TRACE_SUMMARY_PROMPT = """You are compacting the execution history of a penetration testing agent.
+Merge the existing summary and the new steps below into ONE updated summary (max ~400 words).
+
+Keep verbatim anything the agent may need later: IPs, hostnames, ports, service versions,
+CVE IDs, Metasploit module paths and options, credentials, session IDs, file paths, and
+which approaches FAILED (so they are not retried). Drop banners, raw tool noise and repetition.
+
+## Existing Summary
+{previous_summary}
+
+## New Steps
+{steps}
+
+Output only the updated summary as plain text."""
+
+
 # =============================================================================
 # OUTPUT ANALYSIS PROMPT
 # =============================================================================
@@ -497,9 +527,24 @@ When `exploit_succeeded` is true, fill `exploit_details` with:
 
 
 # =============================================================================
-# PENDING OUTPUT ANALYSIS SECTION (injected into REACT_SYSTEM_PROMPT when tool output is pending)
+# PENDING OUTPUT ANALYSIS SECTION (appended to REACT_DYNAMIC_CONTEXT when tool output is pending)
 # =============================================================================
 
+# Used instead of PENDING_OUTPUT_ANALYSIS_SECTION when the tool produced no output
+# (error or empty result): nothing to extract, so no output_analysis is requested.
+PENDING_EMPTY_OUTPUT_SECTION = """
+## Previous Tool Result (NO OUTPUT)
+
+**Tool**: {tool_name}
+**Arguments**: {tool_args}
+**Success**: {success}
+**Error**: {error_message}
+
+The tool returned no output, so there is nothing to analyze. Do NOT include `output_analysis`.
+Decide how to proceed (e.g. fix the arguments, try another tool).
+"""
+
+
 PENDING_OUTPUT_ANALYSIS_SECTION = """
 ## Previous Tool Output (MUST ANALYZE)
 
@@ -6,8 +6,10 @@ Supports iterative Thought-Tool-Output pattern with phase tracking.
 """
 
 from typing import Annotated, TypedDict, Optional, List, Literal, Dict
+from collections import OrderedDict
+import operator
 from datetime import datetime, timezone
-import uuid
+import secrets
 
 from project_settings import get_setting
 
@@ -16,8 +18,20 @@ def utc_now() -> datetime:
     """Get current UTC time as timezone-aware datetime."""
     return datetime.now(timezone.utc)
 
+
+def short_id() -> str:
+    """
+    Random 8-hex-char identifier for steps, todos, questions and objectives.
+
+    Same 32 bits of randomness as the uuid4()[:8] it replaces, without building
+    and slicing a 36-char UUID string. Random rather than a counter, because
+    step ids also key the in-process formatted-step cache and must not repeat
+    across restarts for checkpointed sessions.
+    """
+    return secrets.token_hex(4)
+
 import re
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 from langgraph.graph.message import add_messages
 
 
@@ -44,7 +58,9 @@ AttackPathType = Literal[
 
 class TodoItem(BaseModel):
     """LLM-managed task item for tracking progress."""
-    id: str = Field(default_factory=lambda: str(uuid.uuid4())[:8])
+    model_config = ConfigDict(frozen=True)  # Write-once record; updates go through model_copy
+
+    id: str = Field(default_factory=short_id)
     description: str
     status: TodoStatus = "pending"
     priority: Priority = "medium"
@@ -66,7 +82,9 @@ class TodoItem(BaseModel):
 
 class ExecutionStep(BaseModel):
     """Single step in the Thought-Tool-Output execution trace."""
-    step_id: str = Field(default_factory=lambda: str(uuid.uuid4())[:8])
+    model_config = ConfigDict(frozen=True)  # Immutable record
+
+    step_id: str = Field(default_factory=short_id)
     iteration: int
     timestamp: datetime = Field(default_factory=utc_now)
     phase: Phase
@@ -78,6 +96,7 @@ class ExecutionStep(BaseModel):
     # Tool call (if any)
     tool_name: Optional[str] = None
     tool_args: Optional[dict] = None
+    tool_calls: Optional[List[dict]] = None  # Parallel batch; tool_name/tool_args mirror the first call
 
     # Output (after tool execution)
     tool_output: Optional[str] = None
@@ -101,21 +120,49 @@ class TargetInfo(BaseModel):
     # Session details for richer tracking: {session_id: {'type': str, 'connection': str, 'info': str}}
     session_details: Dict[int, dict] = Field(default_factory=dict)
 
-    def merge_from(self, other: "TargetInfo") -> "TargetInfo":
-        """Merge new target info into existing, avoiding duplicates."""
-        # Merge session_details, with other taking precedence for existing keys
-        merged_session_details = {**self.session_details, **other.session_details}
-        return TargetInfo(
-            primary_target=other.primary_target or self.primary_target,
-            target_type=other.target_type or self.target_type,
-            ports=list(set(self.ports + other.ports)),
-            services=list(set(self.services + other.services)),
-            technologies=list(set(self.technologies + other.technologies)),
-            vulnerabilities=list(set(self.vulnerabilities + other.vulnerabilities)),
-            credentials=self.credentials + [c for c in other.credentials if c not in self.credentials],
-            sessions=list(set(self.sessions + other.sessions)),
-            session_details=merged_session_details,
-        )
+
+# Empty TargetInfo as a state dict; new_target_info() hands out copies with fresh containers
+_EMPTY_TARGET_INFO = TargetInfo().model_dump()
+
+
+def new_target_info() -> dict:
+    """Empty target_info state dict, without running TargetInfo validation."""
+    return {k: type(v)() if isinstance(v, (list, dict)) else v for k, v in _EMPTY_TARGET_INFO.items()}
+
+
+def _credential_key(credential: dict) -> str:
+    """Order-independent fingerprint of a credential dict (values may be unhashable)."""
+    return repr(sorted(credential.items()))
+
+
+def _merge_credentials(existing: List[dict], new: List[dict]) -> List[dict]:
+    """Append credentials not already present, using hashed fingerprints instead of list scans."""
+    seen = {_credential_key(c) for c in existing}
+    merged = list(existing)
+    for credential in new:
+        key = _credential_key(credential)
+        if key not in seen:
+            seen.add(key)
+            merged.append(credential)
+    return merged
+
+
+def merge_target_info(old: dict, new: "ExtractedTargetInfo") -> dict:
+    """
+    Merge extracted info into a target_info dict, avoiding duplicates.
+
+    Works on the raw state dict to avoid building and dumping TargetInfo models on
+    every analysis. List fields are de-duplicated in first-seen order, so an
+    unchanged merge compares equal to the input.
+    """
+    merged = dict(old)
+    merged.setdefault("target_type", None)
+    merged.setdefault("session_details", {})
+    merged["primary_target"] = new.primary_target or old.get("primary_target")
+    for field in ("ports", "services", "technologies", "vulnerabilities", "sessions"):
+        merged[field] = list(dict.fromkeys([*(old.get(field) or []), *getattr(new, field)]))
+    merged["credentials"] = _merge_credentials(old.get("credentials") or [], new.credentials)
+    return merged
 
 
 class PhaseTransitionRequest(BaseModel):
@@ -130,18 +177,25 @@ class PhaseTransitionRequest(BaseModel):
 
 class PhaseHistoryEntry(BaseModel):
     """Record of a phase transition."""
+    model_config = ConfigDict(frozen=True)  # Immutable record
+
     phase: Phase
     entered_at: datetime = Field(default_factory=utc_now)
     exited_at: Optional[datetime] = None
 
 
+def new_phase_history_entry(phase: Phase) -> dict:
+    """PhaseHistoryEntry as a state dict (same shape as model_dump), without validation."""
+    return {"phase": phase, "entered_at": utc_now(), "exited_at": None}
+
+
 # =============================================================================
 # USER Q&A MODELS
 # =============================================================================
 
 class UserQuestionRequest(BaseModel):
     """Request for user clarification from the agent."""
-    question_id: str = Field(default_factory=lambda: str(uuid.uuid4())[:8])
+    question_id: str = Field(default_factory=short_id)
     question: str  # The question text to display to user
     context: str  # Why the agent needs this information
     format: QuestionFormat = "text"  # How user should respond
@@ -170,7 +224,7 @@ class QAHistoryEntry(BaseModel):
 
 class ConversationObjective(BaseModel):
     """Single objective within a continuous conversation."""
-    objective_id: str = Field(default_factory=lambda: str(uuid.uuid4())[:8])
+    objective_id: str = Field(default_factory=short_id)
     content: str  # The user's question/request
     created_at: datetime = Field(default_factory=utc_now)
     completed_at: Optional[datetime] = None
@@ -218,6 +272,12 @@ class TodoItemUpdate(BaseModel):
     priority: Priority = "medium"
 
 
+class ToolCall(BaseModel):
+    """Single tool invocation in a parallel batch (action=use_tool)."""
+    tool_name: str
+    tool_args: dict = Field(default_factory=dict)
+
+
 class ExtractedTargetInfo(BaseModel):
     """Target information extracted from tool output analysis."""
     primary_target: Optional[str] = None
@@ -253,6 +313,7 @@ class LLMDecision(BaseModel):
     # Tool execution fields (when action="use_tool")
     tool_name: Optional[str] = Field(default=None, description="Name of tool to execute")
     tool_args: Optional[dict] = Field(default=None, description="Arguments for the tool")
+    tool_calls: Optional[List[ToolCall]] = Field(default=None, description="Independent tools to run in parallel")
 
     # Phase transition fields (when action="transition_phase")
     phase_transition: Optional[PhaseTransitionDecision] = Field(default=None)
@@ -269,6 +330,16 @@ class LLMDecision(BaseModel):
     # Output analysis (only present when analyzing previous tool output)
     output_analysis: Optional[OutputAnalysisInline] = Field(default=None)
 
+    @model_validator(mode="after")
+    def _normalize_tool_calls(self) -> "LLMDecision":
+        """Mirror the first batched call into tool_name/tool_args; a batch of one is a plain call."""
+        if self.tool_calls:
+            first = self.tool_calls[0]
+            self.tool_name, self.tool_args = first.tool_name, first.tool_args
+            if len(self.tool_calls) == 1:
+                self.tool_calls = None
+        return self
+
 
 class OutputAnalysis(BaseModel):
     """
@@ -334,14 +405,14 @@ class AgentState(TypedDict):
 
     # Phase tracking
     current_phase: Phase
-    phase_history: List[dict]  # List of PhaseHistoryEntry.model_dump()
+    phase_history: Annotated[List[dict], operator.add]  # List of PhaseHistoryEntry.model_dump(); nodes return only new entries
     phase_transition_pending: Optional[dict]  # PhaseTransitionRequest.model_dump() or None
 
     # Attack path routing
     attack_path_type: str  # AttackPathType: "cve_exploit" or "brute_force_credential_guess"
 
     # Execution trace (Thought-Tool-Output history)
-    execution_trace: List[dict]  # List of ExecutionStep.model_dump()
+    execution_trace: Annotated[List[dict], operator.add]  # List of ExecutionStep.model_dump(); nodes return only new steps
 
     # LLM-managed todo list
     todo_list: List[dict]  # List of TodoItem.model_dump()
@@ -377,6 +448,9 @@ class AgentState(TypedDict):
     _decision: Optional[dict]  # LLM decision from think node
     _tool_result: Optional[dict]  # Result from tool execution
     _just_transitioned_to: Optional[str]  # Phase we just transitioned to (prevents re-requesting)
+    _trace_summary: str  # LLM summary of execution steps older than the verbatim window
+    _trace_summary_upto: int  # Number of leading execution_trace steps covered by _trace_summary
+    _target_info_json: Optional[str]  # Prompt-ready JSON of target_info, refreshed when it changes
 
     # Metasploit state tracking
     msf_session_reset_done: bool  # True if metasploit was reset at start of this session
@@ -398,6 +472,7 @@ class InvokeResponse(BaseModel):
     current_phase: Phase = Field(default="informational", description="Current agent phase")
     iteration_count: int = Field(default=0, description="Current iteration number")
     task_complete: bool = Field(default=False, description="Whether the task is complete")
+    message_count: int = Field(default=0, description="Number of messages in the session after this invocation")
 
     # Todo list for frontend display
     todo_list: List[dict] = Field(default_factory=list, description="Current task breakdown")
@@ -456,7 +531,7 @@ def create_initial_state(
         "task_complete": False,
         "completion_reason": None,
         "current_phase": "informational",
-        "phase_history": [PhaseHistoryEntry(phase="informational").model_dump()],
+        "phase_history": [new_phase_history_entry("informational")],
         "phase_transition_pending": None,
         "attack_path_type": "cve_exploit",  # Default, will be classified when entering exploitation
         "execution_trace": [],
@@ -466,7 +541,7 @@ def create_initial_state(
         "current_objective_index": 0,
         "objective_history": [],
         "original_objective": objective,  # Kept for backward compatibility
-        "target_info": TargetInfo().model_dump(),
+        "target_info": new_target_info(),
         "user_id": user_id,
         "project_id": project_id,
         "session_id": session_id,
@@ -484,11 +559,23 @@ def create_initial_state(
         "_decision": None,
         "_tool_result": None,
         "_just_transitioned_to": None,
+        "_trace_summary": "",
+        "_trace_summary_upto": 0,
+        "_target_info_json": None,
         # Metasploit state
         "msf_session_reset_done": False,
     }
 
 
+TODO_STATUS_ICONS = {
+    "pending": "[ ]",
+    "in_progress": "[~]",
+    "completed": "[x]",
+    "blocked": "[!]"
+}
+TODO_PRIORITY_MARKERS = {"high": "!!!", "medium": "!!", "low": "!"}
+
+
 def format_todo_list(todo_list: List[dict]) -> str:
     """Format todo list for display in prompts."""
     if not todo_list:
@@ -496,15 +583,8 @@ def format_todo_list(todo_list: List[dict]) -> str:
 
     lines = []
     for i, todo in enumerate(todo_list, 1):
-        status_icon = {
-            "pending": "[ ]",
-            "in_progress": "[~]",
-            "completed": "[x]",
-            "blocked": "[!]"
-        }.get(todo.get("status", "pending"), "[ ]")
-
-        priority = todo.get("priority", "medium")
-        priority_marker = {"high": "!!!", "medium": "!!", "low": "!"}.get(priority, "!!")
+        status_icon = TODO_STATUS_ICONS.get(todo.get("status", "pending"), "[ ]")
+        priority_marker = TODO_PRIORITY_MARKERS.get(todo.get("priority", "medium"), "!!")
 
         lines.append(f"{i}. {status_icon} {priority_marker} {todo.get('description', 'No description')}")
         if todo.get("notes"):
@@ -518,7 +598,8 @@ def format_execution_trace(
     objectives: List[dict] = None,
     objective_history: List[dict] = None,
     current_objective_index: int = 0,
-    last_n: int = None
+    last_n: int = None,
+    cache_scope: Optional[tuple] = None,
 ) -> str:
     """
     Format execution trace with objective grouping.
@@ -536,6 +617,8 @@ def format_execution_trace(
         objective_history: List of completed objective outcomes
         current_objective_index: Index of current objective
         last_n: Override for number of steps (None = use EXECUTION_TRACE_MEMORY_STEPS)
+        cache_scope: (user_id, project_id, session_id) the trace belongs to; when
+                     given, formatted steps are memoized within that session only
     """
     if not trace:
         return "No steps executed yet."
@@ -572,7 +655,7 @@ def format_execution_trace(
                 lines.append(f"{'='*60}\n")
 
                 for step in obj_steps:
-                    lines.extend(_format_single_step(step))
+                    lines.append(_format_single_step_cached(step, cache_scope))
 
     # Current objective steps (not in completed history)
     current_steps = [s for s in limited_trace if s.get("step_id") not in completed_step_ids]
@@ -588,11 +671,41 @@ def format_execution_trace(
         lines.append(f"{'='*60}\n")
 
         for step in current_steps:
-            lines.extend(_format_single_step(step))
+            lines.append(_format_single_step_cached(step, cache_scope))
 
     return "\n".join(lines)
 
 
+def format_trace_steps(steps: List[dict]) -> str:
+    """Format steps back-to-back without objective grouping (used for summarization)."""
+    return "\n".join("\n".join(_format_single_step(step)) for step in steps)
+
+
+# Steps are immutable once appended to the trace, so their formatted block is
+# reused across iterations instead of re-stringifying the whole history each time.
+# Keyed by (user_id, project_id, session_id, step_id): step ids are short random
+# tokens, so they are only trusted to be unique within one session.
+_STEP_FORMAT_CACHE: "OrderedDict[tuple, str]" = OrderedDict()
+_STEP_FORMAT_CACHE_SIZE = 2048
+
+
+def _format_single_step_cached(step: dict, cache_scope: Optional[tuple] = None) -> str:
+    """Format a single execution step as one text block, memoized per session and step_id."""
+    step_id = step.get("step_id")
+    if not step_id or cache_scope is None:
+        return "\n".join(_format_single_step(step))
+    key = (*cache_scope, step_id)
+    block = _STEP_FORMAT_CACHE.get(key)
+    if block is None:
+        block = "\n".join(_format_single_step(step))
+        _STEP_FORMAT_CACHE[key] = block
+        if len(_STEP_FORMAT_CACHE) > _STEP_FORMAT_CACHE_SIZE:
+            _STEP_FORMAT_CACHE.popitem(last=False)
+    else:
+        _STEP_FORMAT_CACHE.move_to_end(key)
+    return block
+
+
 def _format_single_step(step: dict) -> List[str]:
     """Format a single execution step."""
     lines = []
@@ -608,7 +721,13 @@ def _format_single_step(step: dict) -> List[str]:
     lines.append(f"Thought: {thought[:10000]}..." if len(thought) > 10000 else f"Thought: {thought}")
 
     if tool and tool != "none":
-        lines.append(f"Tool: {tool}")
+        tool_calls = step.get("tool_calls")
+        if tool_calls:
+            # Parallel batch: list every call so the output sections can be matched up
+            lines.append(f"Tools (parallel): {', '.join(tc.get('tool_name', '?') for tc in tool_calls)}")
+            tool_args = [tc.get("tool_args", {}) for tc in tool_calls]
+        else:
+            lines.append(f"Tool: {tool}")
         if tool_args:
             args_str = str(tool_args)
             lines.append(f"Args: {args_str[:10000]}..." if len(args_str) > 10000 else f"Args: {args_str}")
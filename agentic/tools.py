@@ -8,12 +8,16 @@ Includes phase-aware tool management.
 import os
 import re
 import json
+import time
 import asyncio
+import inspect
 import logging
+from collections import OrderedDict
 from typing import List, Optional, Dict, Callable, Awaitable, TYPE_CHECKING
 from contextvars import ContextVar
 
 import httpx
+import orjson
 from langchain_core.tools import tool
 from langchain_mcp_adapters.client import MultiServerMCPClient
 from langchain_neo4j import Neo4jGraph
@@ -26,6 +30,30 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Tenant filter: node pattern matching (variable:Label) or (variable:Label {props})
+# Captures: 1=variable, 2=label, 3=optional content INSIDE braces (without braces)
+# Compiled once at import - _inject_tenant_filter runs on every query_graph call
+_NODE_PATTERN = re.compile(r'\((\w+):(\w+)(?:\s*\{([^}]*)\})?\)')
+_TENANT_PROPS = "user_id: $tenant_user_id, project_id: $tenant_project_id"
+
+# How long the graph schema used for text-to-Cypher is reused before refreshing (seconds)
+_SCHEMA_TTL = 300.0
+
+# Max number of generated Cypher queries remembered per question/schema
+_CYPHER_CACHE_SIZE = 256
+
+
+def _add_tenant_to_node(match: re.Match) -> str:
+    """Add tenant properties to a node pattern."""
+    var_name, label, existing_props_content = match.groups()  # group 3: content INSIDE braces, or None
+
+    # Existing properties first, tenant props appended - fixed order keeps the
+    # rewritten query text stable, so Neo4j can reuse its cached plan
+    existing_props_content = (existing_props_content or "").strip()
+    props = ", ".join((existing_props_content, _TENANT_PROPS)) if existing_props_content else _TENANT_PROPS
+    return f"({var_name}:{label} {{{props}}})"
+
+
 # =============================================================================
 # CONTEXT VARIABLES
 # =============================================================================
@@ -153,6 +181,42 @@ class Neo4jToolManager:
         self.password = password
         self.llm = llm
         self.graph: Optional[Neo4jGraph] = None
+        self._schema_cache: Optional[tuple[float, str]] = None  # (fetched_at, schema)
+        # (normalized question, schema hash) -> Cypher that executed successfully.
+        # Holds tenant-free Cypher only - filters are injected after lookup, so
+        # entries are safe to share across users and projects.
+        self._cypher_cache: "OrderedDict[tuple[str, int], str]" = OrderedDict()
+
+    async def _get_schema(self) -> str:
+        """
+        Get the graph schema for Cypher generation, cached for _SCHEMA_TTL seconds.
+
+        The schema changes rarely compared to how often query_graph is called,
+        so it is fetched at most once per TTL window. On expiry the schema is
+        refreshed from Neo4j so labels added by later recon runs show up; the
+        refresh is a blocking driver call, so it runs off the event loop.
+        """
+        now = time.monotonic()
+        if self._schema_cache is None or now - self._schema_cache[0] > _SCHEMA_TTL:
+            if self._schema_cache is not None:
+                try:
+                    await asyncio.to_thread(self.graph.refresh_schema)
+                except Exception as e:
+                    logger.warning(f"Schema refresh failed, reusing cached schema: {e}")
+            self._schema_cache = (now, self.graph.get_schema)
+        return self._schema_cache[1]
+
+    async def _cypher_cache_key(self, question: str) -> tuple[str, int]:
+        """Build the Cypher cache key from the normalized question and current schema."""
+        return (question.strip().lower(), hash(await self._get_schema()))
+
+    async def _cache_cypher(self, question: str, cypher: str) -> None:
+        """Remember a Cypher query that executed successfully, evicting the oldest entry when full."""
+        key = await self._cypher_cache_key(question)
+        self._cypher_cache[key] = cypher
+        self._cypher_cache.move_to_end(key)
+        if len(self._cypher_cache) > _CYPHER_CACHE_SIZE:
+            self._cypher_cache.popitem(last=False)
 
     def _inject_tenant_filter(self, cypher: str, user_id: str, project_id: str) -> str:
         """
@@ -178,33 +242,15 @@ class Neo4jToolManager:
         Returns:
             Modified Cypher query with tenant filters applied
         """
-        tenant_props = "user_id: $tenant_user_id, project_id: $tenant_project_id"
-
-        def add_tenant_to_node(match: re.Match) -> str:
-            """Add tenant properties to a node pattern."""
-            var_name = match.group(1)
-            label = match.group(2)
-            existing_props_content = match.group(3)  # Content INSIDE braces (without braces), or None
-
-            if existing_props_content is not None:
-                # Has existing properties - merge with tenant props
-                existing_props_content = existing_props_content.strip()
-                if existing_props_content:
-                    # Append tenant props after existing ones
-                    new_props = f"{{{existing_props_content}, {tenant_props}}}"
-                else:
-                    new_props = f"{{{tenant_props}}}"
-                return f"({var_name}:{label} {new_props})"
-            else:
-                # No existing properties, add them
-                return f"({var_name}:{label} {{{tenant_props}}})"
-
-        # Pattern matches: (variable:Label) or (variable:Label {props})
-        # Captures: 1=variable, 2=label, 3=optional content INSIDE braces (without braces)
-        # Uses a non-greedy match for the props content
-        node_pattern = r'\((\w+):(\w+)(?:\s*\{([^}]*)\})?\)'
+        # Fast path: a query with no labeled node pattern (e.g. a bare
+        # aggregate) is returned untouched. Otherwise the rewrite starts at the
+        # first match, so the prefix already scanned by search() is not rescanned
+        first = _NODE_PATTERN.search(cypher)
+        if first is None:
+            return cypher
 
-        result = re.sub(node_pattern, add_tenant_to_node, cypher)
+        start = first.start()
+        result = cypher[:start] + _NODE_PATTERN.sub(_add_tenant_to_node, cypher[start:])
 
         return result
 
@@ -225,7 +271,16 @@ class Neo4jToolManager:
         Returns:
             Generated Cypher query string
         """
-        schema = self.graph.get_schema
+        # First attempt: reuse Cypher that already worked for the same question
+        if not previous_error:
+            key = await self._cypher_cache_key(question)
+            cached = self._cypher_cache.get(key)
+            if cached is not None:
+                self._cypher_cache.move_to_end(key)
+                logger.debug("Cypher cache hit for: %.50s", question)
+                return cached
+
+        schema = await self._get_schema()
 
         # Build the prompt with optional error context for retries
         error_context = ""
@@ -273,11 +328,19 @@ Cypher Query:"""
 
         # Clean up the response - remove markdown code blocks if present
         if cypher.startswith("```"):
-            lines = cypher.split("\n")
-            cypher = "\n".join(lines[1:-1] if lines[-1].strip() == "```" else lines[1:])
+            # Drop the opening fence line (```cypher) and a trailing fence, without splitting every line
+            cypher = cypher.split("\n", 1)[1] if "\n" in cypher else cypher[3:]
+            if cypher.endswith("```"):
+                cypher = cypher[:-3]
 
         return cypher.strip()
 
+    def close(self) -> None:
+        """Close the pooled Neo4j driver (call on shutdown)."""
+        if self.graph is not None:
+            self.graph.close()
+            self.graph = None
+
     def get_tool(self) -> Optional[callable]:
         """
         Set up and return the Neo4j text-to-cypher tool.
@@ -288,10 +351,17 @@ Cypher Query:"""
         logger.info(f"Setting up Neo4j connection to {self.uri}")
 
         try:
+            # One long-lived driver shared by every query_graph call; pool sized
+            # for concurrent sessions, keep-alive avoids re-handshaking after idle
             self.graph = Neo4jGraph(
                 url=self.uri,
                 username=self.user,
-                password=self.password
+                password=self.password,
+                driver_config={
+                    "max_connection_pool_size": 20,
+                    "connection_acquisition_timeout": 30.0,
+                    "keep_alive": True,
+                },
             )
 
             # Store reference to self for use in the tool closure
@@ -350,7 +420,9 @@ Cypher Query:"""
                         logger.info(f"[{user_id}/{project_id}] Filtered Cypher: {filtered_cypher}")
 
                         # Step 3: Execute the filtered query
-                        result = manager.graph.query(
+                        # Neo4jGraph.query is a blocking driver call - run it off the event loop
+                        result = await asyncio.to_thread(
+                            manager.graph.query,
                             filtered_cypher,
                             params={
                                 "tenant_user_id": user_id,
@@ -358,10 +430,14 @@ Cypher Query:"""
                             }
                         )
 
+                        await manager._cache_cypher(question, cypher)
+
                         if not result:
                             return "No results found"
 
-                        return str(result)
+                        # JSON instead of Python repr: faster, and fewer tokens for the LLM
+                        # default=str covers neo4j temporal/spatial values
+                        return orjson.dumps(result, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
 
                     except Exception as e:
                         error_msg = str(e)
@@ -506,6 +582,26 @@ class PhaseAwareToolExecutor:
             if tool_name:
                 self._all_tools[tool_name] = tool
 
+    @staticmethod
+    async def _invoke_tool(tool, tool_input):
+        """
+        Invoke a registered tool without blocking the event loop.
+
+        Invariant: nothing synchronous runs on the loop thread. LangChain tools go
+        through ainvoke (which itself offloads sync tool functions to an executor);
+        plain sync callables are run via asyncio.to_thread. Results that turn out
+        to be awaitable are awaited.
+        """
+        if hasattr(tool, "ainvoke"):
+            result = await tool.ainvoke(tool_input)
+        elif inspect.iscoroutinefunction(tool):
+            result = await tool(tool_input)
+        else:
+            result = await asyncio.to_thread(tool, tool_input)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
     def _extract_text_from_output(self, output) -> str:
         """
         Extract clean text from MCP tool output.
@@ -589,15 +685,13 @@ class PhaseAwareToolExecutor:
             # Execute the tool
             if tool_name == "query_graph":
                 # Graph tool expects 'question' argument
-                question = tool_args.get("question", "")
-                output = await tool.ainvoke(question)
+                output = await self._invoke_tool(tool, tool_args.get("question", ""))
             elif tool_name == "web_search":
                 # Web search tool expects 'query' argument
-                query = tool_args.get("query", "")
-                output = await tool.ainvoke(query)
+                output = await self._invoke_tool(tool, tool_args.get("query", ""))
             else:
                 # MCP tools - invoke with the appropriate argument
-                output = await tool.ainvoke(tool_args)
+                output = await self._invoke_tool(tool, tool_args)
 
             # Extract clean text from MCP response
             # MCP returns list of content blocks: [{'type': 'text', 'text': '...', 'id': '...'}]
@@ -691,7 +785,7 @@ class PhaseAwareToolExecutor:
                     pass
                 except httpx.HTTPError as e:
                     # Connection errors during polling are best-effort, log and continue
-                    logger.debug(f"Progress polling error (non-fatal): {e}")
+                    logger.debug("Progress polling error (non-fatal): %s", e)
                 except Exception as e:
                     # Unexpected errors, log but don't fail the execution
                     logger.warning(f"Progress polling unexpected error: {e}")
@@ -703,6 +797,10 @@ class PhaseAwareToolExecutor:
         """Get all registered tools."""
         return list(self._all_tools.values())
 
+    def get_tool_count(self) -> int:
+        """Get the number of registered tools without building a list."""
+        return len(self._all_tools)
+
     def get_tools_for_phase(self, phase: str) -> List:
         """Get tools allowed in the given phase."""
         return [
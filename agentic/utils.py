@@ -5,16 +5,26 @@ Utility functions for API and prompts that are not orchestrator-specific.
 Orchestrator-specific helpers are in orchestrator_helpers/.
 """
 
+from typing import Optional
+
 from project_settings import get_setting
 from orchestrator_helpers import get_checkpointer
 
 
-def get_session_count() -> int:
-    """Get total number of active sessions."""
+def get_session_count() -> Optional[int]:
+    """
+    Get total number of active sessions.
+
+    Only the in-memory saver exposes its threads cheaply; for persistent savers
+    (AGENT_CHECKPOINT_DB) the count is unavailable and None is returned rather
+    than a misleading 0.
+    """
     cp = get_checkpointer()
-    if cp and hasattr(cp, 'storage'):
+    if cp is None:
+        return 0
+    if hasattr(cp, 'storage'):
         return len(cp.storage)
-    return 0
+    return None
 
 
 def get_session_config_prompt() -> str:
@@ -6,26 +6,20 @@ Supports streaming of LLM thoughts, tool executions, and interactive approval/qu
 """
 
 import asyncio
-import json
 import logging
 from datetime import datetime
-from typing import Dict, Optional, Any, Callable
+from typing import Dict, Optional, Any, Callable, Union
 from enum import Enum
 
+import orjson
 from fastapi import WebSocket, WebSocketDisconnect
-from pydantic import BaseModel, ValidationError
+from pydantic import BaseModel, Field, ValidationError
 from orchestrator_helpers import create_config
 
 
-def serialize_for_json(obj):
-    """Convert objects to JSON-serializable format, handling datetime objects."""
-    if isinstance(obj, datetime):
-        return obj.isoformat()
-    elif isinstance(obj, dict):
-        return {k: serialize_for_json(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [serialize_for_json(item) for item in obj]
-    return obj
+def dumps_message(message: dict) -> str:
+    """Serialize an outgoing message with orjson (datetime and int keys handled natively)."""
+    return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS).decode()
 
 logger = logging.getLogger(__name__)
 
@@ -70,6 +64,12 @@ class MessageType(str, Enum):
 # CLIENT MESSAGE MODELS
 # =============================================================================
 
+class ClientMessage(BaseModel):
+    """Envelope of every client message, parsed straight from the raw frame"""
+    type: Optional[str] = None
+    payload: Any = Field(default_factory=dict)
+
+
 class InitMessage(BaseModel):
     """Initialize WebSocket session"""
     user_id: str
@@ -120,15 +120,14 @@ class WebSocketConnection:
     async def send_message(self, message_type: MessageType, payload: Any):
         """Send JSON message to client"""
         try:
-            # Serialize payload to handle datetime objects
-            serialized_payload = serialize_for_json(payload)
+            # orjson serializes datetime objects itself, no pre-walk of the payload needed
             message = {
                 "type": message_type.value,
-                "payload": serialized_payload,
+                "payload": payload,
                 "timestamp": datetime.utcnow().isoformat()
             }
-            await self.websocket.send_json(message)
-            logger.debug(f"Sent {message_type.value} message to {self.session_id}")
+            await self.websocket.send_text(dumps_message(message))
+            logger.debug("Sent %s message to %s", message_type.value, self.session_id)
         except Exception as e:
             logger.error(f"Error sending message: {e}")
             raise
@@ -308,7 +307,7 @@ class StreamingCallback:
             self._response_sent = True
             logger.info(f"Response sent to session {self.connection.session_id}")
         else:
-            logger.debug(f"Duplicate response blocked for session {self.connection.session_id}")
+            logger.debug("Duplicate response blocked for session %s", self.connection.session_id)
 
     async def on_execution_step(self, step: dict):
         """Called after each execution step"""
@@ -332,7 +331,7 @@ class StreamingCallback:
             self._task_complete_sent = True
             logger.info(f"Task complete sent to session {self.connection.session_id}")
         else:
-            logger.debug(f"Duplicate task_complete blocked for session {self.connection.session_id}")
+            logger.debug("Duplicate task_complete blocked for session %s", self.connection.session_id)
 
 
 # =============================================================================
@@ -349,7 +348,7 @@ class WebSocketHandler:
     async def handle_init(self, connection: WebSocketConnection, payload: dict):
         """Handle session initialization"""
         try:
-            init_msg = InitMessage(**payload)
+            init_msg = InitMessage.model_validate(payload)
 
             # Authenticate connection
             await self.ws_manager.authenticate(
@@ -378,7 +377,7 @@ class WebSocketHandler:
     async def handle_query(self, connection: WebSocketConnection, payload: dict):
         """Handle user query — launches orchestrator as background task"""
         try:
-            query_msg = QueryMessage(**payload)
+            query_msg = QueryMessage.model_validate(payload)
 
             if not connection.authenticated:
                 await connection.send_message(MessageType.ERROR, {
@@ -437,7 +436,7 @@ class WebSocketHandler:
     async def handle_approval(self, connection: WebSocketConnection, payload: dict):
         """Handle approval response — launches as background task"""
         try:
-            approval_msg = ApprovalMessage(**payload)
+            approval_msg = ApprovalMessage.model_validate(payload)
 
             if not connection.authenticated:
                 await connection.send_message(MessageType.ERROR, {
@@ -493,7 +492,7 @@ class WebSocketHandler:
     async def handle_answer(self, connection: WebSocketConnection, payload: dict):
         """Handle answer to agent question — launches as background task"""
         try:
-            answer_msg = AnswerMessage(**payload)
+            answer_msg = AnswerMessage.model_validate(payload)
 
             if not connection.authenticated:
                 await connection.send_message(MessageType.ERROR, {
@@ -548,7 +547,7 @@ class WebSocketHandler:
     async def handle_guidance(self, connection: WebSocketConnection, payload: dict):
         """Handle guidance message while agent is executing."""
         try:
-            guidance_msg = GuidanceMessage(**payload)
+            guidance_msg = GuidanceMessage.model_validate(payload)
 
             if not connection.authenticated:
                 await connection.send_message(MessageType.ERROR, {
@@ -663,14 +662,24 @@ class WebSocketHandler:
         """Handle ping for keep-alive"""
         connection.last_ping = datetime.utcnow()
         await connection.send_message(MessageType.PONG, {})
-        logger.debug(f"Pong sent to session {connection.session_id}")
+        logger.debug("Pong sent to session %s", connection.session_id)
 
-    async def handle_message(self, connection: WebSocketConnection, raw_message: str):
+    async def handle_message(self, connection: WebSocketConnection, raw_message: Union[str, bytes]):
         """Route incoming message to appropriate handler"""
         try:
-            message = json.loads(raw_message)
-            msg_type = message.get("type")
-            payload = message.get("payload", {})
+            # pydantic-core parses the JSON frame directly, no intermediate json.loads dict
+            try:
+                message = ClientMessage.model_validate_json(raw_message)
+            except ValidationError as e:
+                logger.error(f"Invalid JSON message: {e}")
+                await connection.send_message(MessageType.ERROR, {
+                    "message": "Invalid JSON format",
+                    "recoverable": True
+                })
+                return
+
+            msg_type = message.type
+            payload = message.payload
 
             if msg_type == MessageType.INIT:
                 await self.handle_init(connection, payload)
@@ -695,12 +704,6 @@ class WebSocketHandler:
                     "recoverable": True
                 })
 
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON message: {e}")
-            await connection.send_message(MessageType.ERROR, {
-                "message": "Invalid JSON format",
-                "recoverable": True
-            })
         except Exception as e:
             logger.error(f"Error handling message: {e}")
             await connection.send_message(MessageType.ERROR, {
@@ -740,8 +743,8 @@ async def websocket_endpoint(
             if "text" in message_data:
                 raw_message = message_data["text"]
             elif "bytes" in message_data:
-                # Convert bytes to string if sent as binary
-                raw_message = message_data["bytes"].decode("utf-8")
+                # Binary frames are parsed as-is (JSON bytes)
+                raw_message = message_data["bytes"]
             else:
                 logger.warning(f"Received unexpected message type: {message_data}")
                 continue
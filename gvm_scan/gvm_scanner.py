@@ -19,6 +19,7 @@ from datetime import datetime
 from typing import Dict, List, Optional, Set, Tuple, Any, Union
 from xml.etree import ElementTree as ET
 import sys
+import threading
 
 # XML to dict conversion for complete data extraction
 try:
@@ -28,6 +29,13 @@ except ImportError:
     XMLTODICT_AVAILABLE = False
     print("[!] xmltodict not installed. Run: pip install xmltodict")
 
+# Streaming JSON parser for large recon files (the package picks its C backend when available)
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
 # Add project root to path for imports
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
@@ -69,6 +77,10 @@ class GVMScanner:
     Connects to gvmd via Unix socket and executes vulnerability scans
     against targets extracted from RedAmon recon data.
     """
+
+    # (socket_path, scan_config_name) -> (scanner_id, config_id, xml_format_id, port_list_id)
+    _id_cache: Dict[Tuple[str, str], Tuple[Optional[str], ...]] = {}
+    _id_cache_lock = threading.Lock()
     
     def __init__(
         self,
@@ -148,10 +160,7 @@ class GVMScanner:
                 self.gmp.authenticate(self.username, self.password)
 
                 # Cache commonly needed IDs
-                self._cache_scanner_id()
-                self._cache_config_id()
-                self._cache_report_format_id()
-                self._cache_port_list_id()
+                self._load_cached_ids()
 
                 self.connected = True
                 print(f"[+] Connected to GVM at {self.socket_path}")
@@ -200,6 +209,26 @@ class GVMScanner:
         self.connected = False
         self.gmp = None
     
+    def _load_cached_ids(self):
+        """
+        Resolve scanner, config, report format and port list IDs.
+
+        The IDs are the same for every connection to the same gvmd with the
+        same scan config, so they are looked up once per process and shared by
+        reconnects and by the per-worker scanners of a concurrent run.
+        """
+        key = (self.socket_path, self.scan_config_name)
+        with GVMScanner._id_cache_lock:
+            ids = GVMScanner._id_cache.get(key)
+            if ids is None:
+                self._cache_scanner_id()
+                self._cache_config_id()
+                self._cache_report_format_id()
+                self._cache_port_list_id()
+                ids = (self.scanner_id, self.config_id, self.xml_format_id, self.port_list_id)
+                GVMScanner._id_cache[key] = ids
+        self.scanner_id, self.config_id, self.xml_format_id, self.port_list_id = ids
+
     def _cache_scanner_id(self):
         """Get and cache OpenVAS scanner ID."""
         scanners = self.gmp.get_scanners()
@@ -799,6 +828,127 @@ class GVMScanner:
                     self.delete_target(target_id)
 
 
+    def scan_targets_per_host(
+        self,
+        targets: List[str],
+        target_name: str,
+        cleanup: Optional[bool] = None
+    ) -> List[Dict]:
+        """
+        Scan several targets in one GVM task and split the report per target.
+
+        One task per batch amortizes gvmd's fixed per-task cost (target
+        creation, NVT loading, report setup and teardown); splitting keeps one
+        results entry per target for downstream consumers.
+
+        Args:
+            targets: List of IPs or hostnames to scan together
+            target_name: Name for the scan target/task
+            cleanup: Delete target and task after scan
+
+        Returns:
+            One results dictionary per target, in the order of `targets`
+        """
+        results = self.scan_targets(targets=targets, target_name=target_name, cleanup=cleanup)
+        if len(targets) <= 1:
+            return [results]
+        if "raw_data" not in results:
+            # Failed or empty scan: every target in the batch shares the outcome
+            return [{**results, "targets": [target]} for target in targets]
+        return [self._split_report_for_target(results, target) for target in targets]
+
+    def _split_report_for_target(self, results: Dict, target: str) -> Dict:
+        """
+        Build the results of a single target out of a multi-target report.
+
+        GVM tags every result and host entry with the scanned IP (and the
+        hostname when a hostname was scanned), so the raw report is filtered to
+        that target's entries and the summary is recomputed from them.
+        """
+        raw_data = results["raw_data"]
+        report = raw_data.get('report', {})
+        inner_report = report.get('report', report) if isinstance(report, dict) else {}
+
+        results_data = self._safe_get(inner_report, 'results', {})
+        result_list = self._safe_get(results_data, 'result', [])
+        if isinstance(result_list, dict):
+            result_list = [result_list]
+        elif not isinstance(result_list, list):
+            result_list = []
+        target_results = [
+            r for r in result_list
+            if isinstance(r, dict) and target in self._result_host_names(r.get('host'))
+        ]
+
+        host_list = self._safe_get(inner_report, 'host', [])
+        if isinstance(host_list, dict):
+            host_list = [host_list]
+        elif not isinstance(host_list, list):
+            host_list = []
+        target_hosts = [
+            h for h in host_list
+            if isinstance(h, dict) and target in self._report_host_names(h)
+        ]
+
+        target_inner = {
+            **inner_report,
+            'results': {**results_data, 'result': target_results} if isinstance(results_data, dict)
+                       else {'result': target_results},
+            'host': target_hosts,
+            'hosts': {'count': str(len(target_hosts))},
+        }
+        if isinstance(report, dict) and 'report' in report:
+            target_raw = {**raw_data, 'report': {**report, 'report': target_inner}}
+        else:
+            target_raw = {**raw_data, 'report': target_inner}
+
+        summary = self._compute_summary(target_raw)
+        return {
+            "report_id": results.get("report_id"),
+            "scan_start": results.get("scan_start"),
+            "scan_end": results.get("scan_end"),
+            "scan_run_status": results.get("scan_run_status"),
+            "hosts_scanned": summary.get("hosts_scanned", 0),
+            "vulnerability_count": summary.get("vulnerability_count", 0),
+            "severity_summary": summary.get("severity_summary", {}),
+            "unique_cves": summary.get("unique_cves", []),
+            "unique_cve_count": summary.get("unique_cve_count", 0),
+            "ports_affected": summary.get("ports_affected", []),
+            "vulnerabilities": summary.get("vulnerabilities", []),
+            "raw_data": target_raw,
+            "scan_name": results.get("scan_name"),
+            "targets": [target],
+            "status": results.get("status"),
+        }
+
+    @staticmethod
+    def _result_host_names(host: Any) -> Set[str]:
+        """IP and hostname a report result belongs to (<host>IP<hostname>name</hostname></host>)."""
+        if isinstance(host, str):
+            return {host.strip()}
+        if not isinstance(host, dict):
+            return set()
+        names = {host.get('#text'), host.get('hostname')}
+        return {n.strip() for n in names if isinstance(n, str) and n.strip()}
+
+    @staticmethod
+    def _report_host_names(host: Dict) -> Set[str]:
+        """IP and detected hostnames of a report host entry."""
+        names = set()
+        ip = host.get('ip')
+        if isinstance(ip, str):
+            names.add(ip.strip())
+        details = host.get('detail', [])
+        if isinstance(details, dict):
+            details = [details]
+        for detail in details if isinstance(details, list) else []:
+            if isinstance(detail, dict) and detail.get('name') == 'hostname':
+                value = detail.get('value')
+                if isinstance(value, str):
+                    names.add(value.strip())
+        return names
+
+
 def extract_targets_from_recon(recon_data: Dict) -> Tuple[Set[str], Set[str]]:
     """
     Extract unique IPs and hostnames from recon JSON data.
@@ -846,10 +996,58 @@ def extract_targets_from_recon(recon_data: Dict) -> Tuple[Set[str], Set[str]]:
     return ips, hostnames
 
 
+# Parts of the recon JSON the scanner reads (target extraction and live-target
+# check); everything else (http_probe results, resource_enum, ...) is skipped
+RECON_SECTIONS = ("metadata", "domain", "dns", "port_scan.summary", "http_probe.summary")
+
+
+def _stream_recon_sections(f, sections: Tuple[str, ...] = RECON_SECTIONS) -> Dict:
+    """
+    Build a dict holding only the requested sections of a recon JSON stream.
+
+    Unrequested sections are parsed as events and discarded, so memory stays
+    proportional to the kept sections instead of the whole file. Top-level keys
+    that are present but not kept map to {} so presence checks still work.
+    """
+    data: Dict = {}
+    current = None  # (section, builder) being built
+    for prefix, event, value in ijson.parse(f, use_float=True):
+        if current is not None:
+            section, builder = current
+            builder.event(event, value)
+            if prefix == section and event in ("end_map", "end_array"):
+                _set_dotted(data, section, builder.value)
+                current = None
+            continue
+        if prefix == "" and event == "map_key":
+            data.setdefault(value, {})
+            continue
+        if prefix in sections:
+            if event in ("start_map", "start_array"):
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+                current = (prefix, builder)
+            elif event not in ("map_key", "end_map", "end_array"):
+                _set_dotted(data, prefix, value)
+    return data
+
+
+def _set_dotted(data: Dict, path: str, value: Any) -> None:
+    """Assign value at a dotted path (e.g. 'port_scan.summary'), creating parents."""
+    *parents, leaf = path.split(".")
+    for key in parents:
+        data = data.setdefault(key, {})
+    data[leaf] = value
+
+
 def load_recon_file(project_id: str, recon_dir: Path = None) -> Dict:
     """
     Load recon JSON file for a project.
 
+    With ijson installed, only RECON_SECTIONS are materialized (recon output
+    for large scopes can be hundreds of MB, nearly all of it unused here);
+    otherwise the whole file is loaded with json.load.
+
     Args:
         project_id: Project ID used in the filename
         recon_dir: Directory containing recon files
@@ -865,10 +1063,30 @@ def load_recon_file(project_id: str, recon_dir: Path = None) -> Dict:
     if not recon_file.exists():
         raise FileNotFoundError(f"Recon file not found: {recon_file}")
 
+    if IJSON_AVAILABLE:
+        with open(recon_file, 'rb') as f:
+            return _stream_recon_sections(f)
+
     with open(recon_file, 'r') as f:
         return json.load(f)
 
 
+def write_json_atomic(output_file: Path, data: Dict) -> None:
+    """
+    Write JSON through a temp file and rename it over the target.
+
+    Readers (webapp download, graph update) never see a half-written file, and
+    a crash mid-write leaves the previous version intact. The payload is
+    serialized once and written with a single buffered write.
+    """
+    output_file = Path(output_file)
+    tmp_file = output_file.with_name(output_file.name + ".tmp")
+    payload = json.dumps(data, indent=2).encode("utf-8")
+    with open(tmp_file, 'wb', buffering=1 << 20) as f:
+        f.write(payload)
+    os.replace(tmp_file, output_file)
+
+
 def save_vuln_results(
     results: Dict,
     project_id: str,
@@ -891,8 +1109,7 @@ def save_vuln_results(
     output_dir.mkdir(parents=True, exist_ok=True)
     output_file = output_dir / f"gvm_{project_id}.json"
 
-    with open(output_file, 'w') as f:
-        json.dump(results, f, indent=2)
+    write_json_atomic(output_file, results)
 
     print(f"[+] Results saved to: {output_file}")
     return output_file
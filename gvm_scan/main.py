@@ -17,8 +17,10 @@ Usage:
 
 import os
 import sys
-import json
 import time
+import threading
+from itertools import batched
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 
@@ -42,6 +44,7 @@ from gvm_scan.gvm_scanner import (
     extract_targets_from_recon,
     load_recon_file,
     save_vuln_results,
+    write_json_atomic,
     update_graph_from_gvm_results,
     GVM_AVAILABLE,
 )
@@ -128,6 +131,8 @@ def run_vulnerability_scan(
     task_timeout = get_setting('TASK_TIMEOUT', 14400)
     poll_interval = get_setting('POLL_INTERVAL', 30)
     cleanup = get_setting('CLEANUP_AFTER_SCAN', True)
+    max_concurrent_scans = max(1, int(get_setting('MAX_CONCURRENT_SCANS', 1) or 1))
+    targets_per_task = max(1, int(get_setting('TARGETS_PER_TASK', 16) or 1))
 
     print("\n" + "=" * 70)
     print("           RedAmon - GVM Vulnerability Scanner")
@@ -138,6 +143,8 @@ def run_vulnerability_scan(
     print(f"  Task Timeout:  {task_timeout}s")
     print(f"  Poll Interval: {poll_interval}s")
     print(f"  Cleanup After: {cleanup}")
+    print(f"  Concurrency:   {max_concurrent_scans} scan(s)")
+    print(f"  Batch Size:    {targets_per_task} target(s) per task")
     print("=" * 70 + "\n")
 
     # Check if GVM library is available
@@ -248,44 +255,132 @@ def run_vulnerability_scan(
     output_file = OUTPUT_DIR / f"gvm_{project_id}.json"
     
     def save_incremental():
-        """Save current results incrementally."""
-        with open(output_file, 'w') as f:
-            json.dump(results, f, indent=2)
-    
+        """Save current results incrementally (atomic replace, never a partial file)."""
+        write_json_atomic(output_file, results)
+
+    # Worker threads record finished scans concurrently
+    results_lock = threading.Lock()
+
+    def record_scans(scan_results_list: list):
+        """Append one task's per-target results, update the summary and save progress."""
+        with results_lock:
+            for scan_results in scan_results_list:
+                results["scans"].append(scan_results)
+
+                # Update summary
+                if "severity_summary" in scan_results:
+                    for sev, count in scan_results["severity_summary"].items():
+                        results["summary"][sev] += count
+                results["summary"]["total_vulnerabilities"] += scan_results.get("vulnerability_count", 0)
+                results["summary"]["hosts_scanned"] += scan_results.get("hosts_scanned", 0)
+
+            # Save after each task
+            save_incremental()
+        print(f"    [+] Progress saved to {output_file}")
+
+    def scan_ips(gvm: GVMScanner, batch_no: int, batch: list) -> list:
+        if len(batch) == 1:
+            target_name = f"IP_{batch[0].replace('.', '_')}"
+        else:
+            target_name = f"IPs_batch_{batch_no}"
+        ip_results_list = gvm.scan_targets_per_host(
+            targets=batch,
+            target_name=target_name,
+            cleanup=cleanup
+        )
+        for ip, ip_results in zip(batch, ip_results_list):
+            ip_results["scan_type"] = "ip_scan"
+            ip_results["target_ip"] = ip
+        return ip_results_list
+
+    def scan_hostnames(gvm: GVMScanner, batch_no: int, batch: list) -> list:
+        if len(batch) == 1:
+            target_name = f"Host_{batch[0].replace('.', '_')}"
+        else:
+            target_name = f"Hosts_batch_{batch_no}"
+        hostname_results_list = gvm.scan_targets_per_host(
+            targets=batch,
+            target_name=target_name,
+            cleanup=cleanup
+        )
+        for hostname, hostname_results in zip(batch, hostname_results_list):
+            hostname_results["scan_type"] = "hostname_scan"
+            hostname_results["target_hostname"] = hostname
+        return hostname_results_list
+
+    def run_phase(targets: list, label: str, scan_batch) -> None:
+        """
+        Scan targets in batches of TARGETS_PER_TASK, one GVM task per batch,
+        saving progress after every task.
+
+        With MAX_CONCURRENT_SCANS > 1, batches run in a thread pool; a GMP
+        connection is not thread-safe, so each worker opens its own and all of
+        them are closed when the phase ends.
+        """
+        batches = [list(batch) for batch in batched(targets, targets_per_task)]
+        workers = min(max_concurrent_scans, len(batches))
+        if workers <= 1:
+            for i, batch in enumerate(batches, 1):
+                print(f"\n[*] {label} task {i}/{len(batches)}: {', '.join(batch)}")
+                record_scans(scan_batch(scanner, i, batch))
+            return
+
+        local = threading.local()
+        worker_scanners = []
+
+        def worker(batch_no: int, batch: list) -> list:
+            gvm = getattr(local, "scanner", None)
+            if gvm is None:
+                gvm = GVMScanner()
+                with results_lock:
+                    worker_scanners.append(gvm)
+                if not gvm.connect(max_retries=10, retry_interval=15):
+                    raise RuntimeError("Failed to open worker connection to GVM")
+                local.scanner = gvm
+            print(f"\n[*] {label} task {batch_no}: {', '.join(batch)}")
+            return scan_batch(gvm, batch_no, batch)
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(worker, batch_no, batch): batch
+                    for batch_no, batch in enumerate(batches, 1)
+                }
+                for i, future in enumerate(as_completed(futures), 1):
+                    batch = futures[future]
+                    try:
+                        scan_results_list = future.result()
+                    except Exception as e:
+                        print(f"    [!] Scan failed for {', '.join(batch)}: {e}")
+                        scan_results_list = [
+                            {
+                                "scan_name": target,
+                                "targets": [target],
+                                "status": "error",
+                                "error": str(e),
+                                "vulnerabilities": []
+                            }
+                            for target in batch
+                        ]
+                    print(f"    [+] {label} task {i}/{len(batches)} finished: {', '.join(batch)}")
+                    record_scans(scan_results_list)
+        finally:
+            for gvm in worker_scanners:
+                gvm.disconnect()
+
     try:
         # =====================================================================
-        # PHASE 1: Scan IPs (one at a time for incremental saving)
+        # PHASE 1: Scan IPs (batched per task, split per target for incremental saving)
         # =====================================================================
         if scan_targets in ("both", "ips_only") and ips:
             ip_list = list(ips)
-            print(f"\n[*] PHASE 1: Scanning {len(ip_list)} IP addresses (individually)...")
+            print(f"\n[*] PHASE 1: Scanning {len(ip_list)} IP addresses "
+                  f"({targets_per_task} per task, up to {max_concurrent_scans} tasks at a time)...")
             print("-" * 50)
-            
-            for i, ip in enumerate(ip_list, 1):
-                print(f"\n[*] IP {i}/{len(ip_list)}: {ip}")
-                
-                ip_results = scanner.scan_targets(
-                    targets=[ip],
-                    target_name=f"IP_{ip.replace('.', '_')}",
-                    cleanup=cleanup
-                )
-                ip_results["scan_type"] = "ip_scan"
-                ip_results["target_ip"] = ip
-                results["scans"].append(ip_results)
-                
-                # Update summary
-                if "severity_summary" in ip_results:
-                    for sev, count in ip_results["severity_summary"].items():
-                        results["summary"][sev] += count
-                results["summary"]["total_vulnerabilities"] += ip_results.get("vulnerability_count", 0)
-                results["summary"]["hosts_scanned"] += ip_results.get("hosts_scanned", 0)
-                
-                # Save after each IP
-                save_incremental()
-                print(f"    [+] Progress saved to {output_file}")
-        
+            run_phase(ip_list, "IP", scan_ips)
+
         # =====================================================================
-        # PHASE 2: Scan Hostnames (one at a time for incremental saving)
+        # PHASE 2: Scan Hostnames (batched per task, split per target for incremental saving)
         # Reconnect to GVM to avoid stale socket after long Phase 1 scans
         # =====================================================================
         if scan_targets in ("both", "hostnames_only") and hostnames:
@@ -296,32 +391,11 @@ def run_vulnerability_scan(
                 if not scanner.connect(max_retries=10, retry_interval=15):
                     raise RuntimeError("Failed to reconnect to GVM before Phase 2")
             hostname_list = list(hostnames)
-            print(f"\n[*] PHASE 2: Scanning {len(hostname_list)} hostnames (individually)...")
+            print(f"\n[*] PHASE 2: Scanning {len(hostname_list)} hostnames "
+                  f"({targets_per_task} per task, up to {max_concurrent_scans} tasks at a time)...")
             print("-" * 50)
-            
-            for i, hostname in enumerate(hostname_list, 1):
-                print(f"\n[*] Hostname {i}/{len(hostname_list)}: {hostname}")
-                
-                hostname_results = scanner.scan_targets(
-                    targets=[hostname],
-                    target_name=f"Host_{hostname.replace('.', '_')}",
-                    cleanup=cleanup
-                )
-                hostname_results["scan_type"] = "hostname_scan"
-                hostname_results["target_hostname"] = hostname
-                results["scans"].append(hostname_results)
-                
-                # Update summary
-                if "severity_summary" in hostname_results:
-                    for sev, count in hostname_results["severity_summary"].items():
-                        results["summary"][sev] += count
-                results["summary"]["total_vulnerabilities"] += hostname_results.get("vulnerability_count", 0)
-                results["summary"]["hosts_scanned"] += hostname_results.get("hosts_scanned", 0)
+            run_phase(hostname_list, "Hostname", scan_hostnames)
 
-                # Save after each hostname
-                save_incremental()
-                print(f"    [+] Progress saved to {output_file}")
-        
         # Final save
         save_vuln_results(results, project_id)
         
@@ -0,0 +1,72 @@
+"""
+Regression checks for load_recon_file (streamed ijson path and json.load fallback).
+
+Run from the repository root:
+    python -m unittest discover -s gvm_scan/tests -t .
+"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from gvm_scan import gvm_scanner
+
+RECON_DATA = {
+    "metadata": {"root_domain": "example.com", "scan_duration": 12.5, "modules": ["dns", "http"]},
+    "domain": "example.com",
+    "dns": {
+        "domain": {"has_records": True, "ips": {"ipv4": ["192.0.2.1"], "ipv6": []}},
+        "subdomains": {
+            "www.example.com": {"has_records": True, "ips": {"ipv4": ["192.0.2.2"], "ipv6": ["2001:db8::2"]}},
+            "old.example.com": {"has_records": False, "ips": {"ipv4": [], "ipv6": []}},
+        },
+    },
+    "port_scan": {
+        "by_host": {"192.0.2.1": {"ports": [80, 443]}},
+        "summary": {"hosts_with_open_ports": 1, "total_open_ports": 2},
+    },
+    "http_probe": {
+        "by_url": {"https://example.com": {"status_code": 200}},
+        "summary": {"live_urls": 1},
+    },
+    "resource_enum": {"endpoints": [{"path": "/login"}]},
+}
+
+
+class LoadReconFileTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.recon_dir = Path(tmp.name)
+        (self.recon_dir / "recon_p1.json").write_text(json.dumps(RECON_DATA))
+
+    @unittest.skipUnless(gvm_scanner.IJSON_AVAILABLE, "ijson not installed")
+    def test_streamed_load_keeps_needed_sections(self):
+        data = gvm_scanner.load_recon_file("p1", recon_dir=self.recon_dir)
+
+        self.assertEqual(data["metadata"], RECON_DATA["metadata"])
+        self.assertEqual(data["domain"], RECON_DATA["domain"])
+        self.assertEqual(data["dns"], RECON_DATA["dns"])
+        self.assertEqual(data["port_scan"], {"summary": RECON_DATA["port_scan"]["summary"]})
+        self.assertEqual(data["http_probe"], {"summary": RECON_DATA["http_probe"]["summary"]})
+        self.assertEqual(data["resource_enum"], {})
+        self.assertEqual(
+            gvm_scanner.extract_targets_from_recon(data),
+            gvm_scanner.extract_targets_from_recon(RECON_DATA),
+        )
+
+    def test_fallback_load_returns_whole_file(self):
+        with mock.patch.object(gvm_scanner, "IJSON_AVAILABLE", False):
+            data = gvm_scanner.load_recon_file("p1", recon_dir=self.recon_dir)
+        self.assertEqual(data, RECON_DATA)
+
+    def test_missing_file_raises(self):
+        with self.assertRaises(FileNotFoundError):
+            gvm_scanner.load_recon_file("missing", recon_dir=self.recon_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
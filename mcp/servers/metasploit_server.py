@@ -23,8 +23,9 @@ import os
 import re
 import json
 import atexit
+from collections import deque
 from http.server import HTTPServer, BaseHTTPRequestHandler
-from typing import Optional, Set, List
+from typing import Deque, Optional, Set
 
 # Server configuration
 SERVER_NAME = "metasploit"
@@ -42,9 +43,20 @@ MSF_EXPLOIT_QUIET_PERIOD = float(os.getenv("MSF_EXPLOIT_QUIET_PERIOD", "180"))
 # Other commands: 2 min timeout, 3s quiet
 MSF_DEFAULT_TIMEOUT = int(os.getenv("MSF_DEFAULT_TIMEOUT", "120"))
 MSF_DEFAULT_QUIET_PERIOD = float(os.getenv("MSF_DEFAULT_QUIET_PERIOD", "3"))
+# Lines kept for the live progress endpoint (it only ever shows the tail)
+MSF_PROGRESS_TAIL_LINES = 100
 
 mcp = FastMCP(SERVER_NAME)
 
+# Output-cleaning patterns, compiled once (applied to every output line)
+# CSI (incl. private mode like \x1b[?25h cursor show/hide), OSC and charset-select sequences
+_ANSI_ESCAPE_RE = re.compile(r'\x1b\[[\?]?[0-9;]*[a-zA-Z]|\x1b\][^\x07]*\x07|\x1b[()][AB012]')
+_ANSI_ESCAPE_PROGRESS_RE = re.compile(r'\x1b\[[0-9;]*[a-zA-Z]|\x1b\][^\x07]*\x07|\x1b[()][AB012]')
+_CONTROL_CHARS_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]')
+_MSF_PROMPT_RE = re.compile(r'^msf\d?\s*([\w\(\)/]+\s*)?>?\s*$', re.IGNORECASE)
+_SHELL_PROMPT_RE = re.compile(r'^[\$#>]\s*$')
+_GARBLED_ECHO_RE = re.compile(r'^msf\s+\S+>\S')
+
 
 class PersistentMsfConsole:
     """
@@ -64,7 +76,8 @@ class PersistentMsfConsole:
         self._initialized = False
 
         # Progress tracking for live updates
-        self._current_output: List[str] = []
+        self._current_output: Deque[str] = deque(maxlen=MSF_PROGRESS_TAIL_LINES)
+        self._current_line_count: int = 0
         self._execution_active: bool = False
         self._current_command: str = ""
         self._execution_start_time: float = 0
@@ -157,24 +170,19 @@ class PersistentMsfConsole:
 
         Prompt redraws and cursor movements shouldn't reset the quiet period timer.
         """
-        # Strip ANSI escape codes for checking
-        # Includes private mode sequences like \x1b[?25h (show cursor) / \x1b[?25l (hide cursor)
-        clean = re.sub(r'\x1b\[[\?]?[0-9;]*[a-zA-Z]', '', line)
-        # Also strip OSC sequences and other escape types
-        clean = re.sub(r'\x1b\][^\x07]*\x07', '', clean)
-        clean = re.sub(r'\x1b[()][AB012]', '', clean)
-        clean = clean.strip()
+        # Strip ANSI escape codes (CSI incl. cursor show/hide, OSC, charset) for checking
+        clean = _ANSI_ESCAPE_RE.sub('', line).strip()
 
         # Empty after stripping = noise
         if not clean:
             return False
 
         # Just the msf prompt = noise (variations: "msf >", "msf6 >", "msf exploit(...) >")
-        if re.match(r'^msf\d?\s*([\w\(\)/]+\s*)?>?\s*$', clean, re.IGNORECASE):
+        if _MSF_PROMPT_RE.match(clean):
             return False
 
         # Shell prompt noise ($ or # alone, possibly with hostname)
-        if re.match(r'^[\$#>]\s*$', clean):
+        if _SHELL_PROMPT_RE.match(clean):
             return False
 
         # Just cursor positioning or escape sequences = noise
@@ -193,7 +201,8 @@ class PersistentMsfConsole:
         """
         # Initialize progress tracking
         with self._progress_lock:
-            self._current_output = []
+            self._current_output.clear()
+            self._current_line_count = 0
             self._execution_active = True
             self._execution_start_time = time.time()
 
@@ -218,6 +227,7 @@ class PersistentMsfConsole:
                 # Track progress for HTTP endpoint (include all lines for display)
                 with self._progress_lock:
                     self._current_output.append(stripped)
+                    self._current_line_count += 1
 
             except queue.Empty:
                 elapsed = time.time() - start_time
@@ -302,7 +312,8 @@ class PersistentMsfConsole:
         self.stop(force=True)
         # Clear progress tracking state
         with self._progress_lock:
-            self._current_output = []
+            self._current_output.clear()
+            self._current_line_count = 0
             self._execution_active = False
             self._current_command = ""
             self._execution_start_time = 0
@@ -317,14 +328,14 @@ class PersistentMsfConsole:
     def get_progress(self) -> dict:
         """Get current execution progress (thread-safe) for HTTP endpoint."""
         with self._progress_lock:
-            # Join last 100 lines and clean ANSI codes for display
-            raw_output = '\n'.join(self._current_output[-100:])
+            # Join the buffered tail lines and clean ANSI codes for display
+            raw_output = '\n'.join(self._current_output)
             clean_output = _clean_ansi_for_progress(raw_output)
             return {
                 "active": self._execution_active,
                 "command": self._current_command[:100] if self._current_command else "",
                 "elapsed_seconds": round(time.time() - self._execution_start_time, 1) if self._execution_active else 0,
-                "line_count": len(self._current_output),
+                "line_count": self._current_line_count,
                 "output": clean_output
             }
 
@@ -369,7 +380,7 @@ def _get_timing_for_command(command: str) -> tuple[float, float]:
         return (60, MSF_DEFAULT_QUIET_PERIOD)
     elif 'sessions' in cmd_lower:
         return (60, 5.0)
-    elif any(x in cmd_lower for x in ['info', 'show']):
+    elif 'info' in cmd_lower or 'show' in cmd_lower:
         return (60, MSF_DEFAULT_QUIET_PERIOD)
     else:
         return (MSF_DEFAULT_TIMEOUT, MSF_DEFAULT_QUIET_PERIOD)
@@ -378,9 +389,7 @@ def _get_timing_for_command(command: str) -> tuple[float, float]:
 def _clean_ansi_output(text: str) -> str:
     """Remove ANSI escape codes and control characters from msfconsole output."""
     # Remove ANSI escape sequences (including private mode like \x1b[?25h cursor show/hide)
-    text = re.sub(r'\x1b\[[\?]?[0-9;]*[a-zA-Z]', '', text)
-    text = re.sub(r'\x1b\][^\x07]*\x07', '', text)
-    text = re.sub(r'\x1b[()][AB012]', '', text)
+    text = _ANSI_ESCAPE_RE.sub('', text)
 
     cleaned_lines = []
     for line in text.split('\n'):
@@ -402,7 +411,7 @@ def _clean_ansi_output(text: str) -> str:
                 line = line[1:]
 
         # Remove control characters
-        line = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]', '', line)
+        line = _CONTROL_CHARS_RE.sub('', line)
         line = line.rstrip()
 
         if line or (cleaned_lines and cleaned_lines[-1]):
@@ -417,7 +426,7 @@ def _clean_ansi_output(text: str) -> str:
     for line in cleaned_lines:
         if line.startswith('<'):
             continue
-        if re.match(r'^msf\s+\S+>\S', line):
+        if _GARBLED_ECHO_RE.match(line):
             continue
         if len(line) < 5 and not line.startswith('[') and '=>' not in line:
             continue
@@ -434,11 +443,9 @@ def _clean_ansi_for_progress(text: str) -> str:
     but removes escape codes for clean display.
     """
     # Remove ANSI escape sequences (colors, formatting)
-    text = re.sub(r'\x1b\[[0-9;]*[a-zA-Z]', '', text)
-    text = re.sub(r'\x1b\][^\x07]*\x07', '', text)
-    text = re.sub(r'\x1b[()][AB012]', '', text)
+    text = _ANSI_ESCAPE_PROGRESS_RE.sub('', text)
     # Remove other control characters except newlines
-    text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]', '', text)
+    text = _CONTROL_CHARS_RE.sub('', text)
     return text
 
 
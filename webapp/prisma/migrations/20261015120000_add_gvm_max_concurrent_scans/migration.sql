@@ -0,0 +1,2 @@
+-- AlterTable: Add GVM concurrent scan limit
+ALTER TABLE "projects" ADD COLUMN "gvm_max_concurrent_scans" INTEGER NOT NULL DEFAULT 1;
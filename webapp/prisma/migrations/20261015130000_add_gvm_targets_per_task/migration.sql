@@ -0,0 +1,2 @@
+-- AlterTable: Add GVM targets per task (batch size)
+ALTER TABLE "projects" ADD COLUMN "gvm_targets_per_task" INTEGER NOT NULL DEFAULT 16;
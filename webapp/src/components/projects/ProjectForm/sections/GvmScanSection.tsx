@@ -102,6 +102,32 @@ export function GvmScanSection({ data, updateField }: GvmScanSectionProps) {
                 />
                 <span className={styles.fieldHint}>Seconds between scan status checks. Lower values give faster log updates.</span>
               </div>
+
+              <div className={styles.fieldGroup}>
+                <label className={styles.fieldLabel}>Concurrent Scans</label>
+                <input
+                  type="number"
+                  className="textInput"
+                  value={data.gvmMaxConcurrentScans}
+                  onChange={(e) => updateField('gvmMaxConcurrentScans', parseInt(e.target.value) || 1)}
+                  min={1}
+                  max={10}
+                />
+                <span className={styles.fieldHint}>Targets scanned in parallel, each on its own GVM connection. Higher values finish sooner but load the scanner more. Default: 1 (one at a time).</span>
+              </div>
+
+              <div className={styles.fieldGroup}>
+                <label className={styles.fieldLabel}>Targets per Task</label>
+                <input
+                  type="number"
+                  className="textInput"
+                  value={data.gvmTargetsPerTask}
+                  onChange={(e) => updateField('gvmTargetsPerTask', parseInt(e.target.value) || 1)}
+                  min={1}
+                  max={64}
+                />
+                <span className={styles.fieldHint}>Targets combined into one GVM task, with results still reported per target. Larger batches avoid per-task overhead; 1 runs one task per target. Default: 16.</span>
+              </div>
             </div>
           </div>
 